@@ -3,6 +3,8 @@ from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
 from unfold.admin import ModelAdmin
 
+from core.autocomplete import PrefixAutocompleteMixin
+
 from .models import UserProfile
 
 
@@ -12,8 +14,9 @@ class UserProfileInline(admin.StackedInline):
     verbose_name_plural = "Profile"
 
 
-class CustomUserAdmin(UserAdmin, ModelAdmin):
+class CustomUserAdmin(PrefixAutocompleteMixin, UserAdmin, ModelAdmin):
     inlines = (UserProfileInline,)
+    autocomplete_search_fields = ["username"]
     list_display = (
         "username",
         "email",
@@ -24,6 +27,7 @@ class CustomUserAdmin(UserAdmin, ModelAdmin):
     )
 
     def get_groups(self, obj):
+        # Served from the groups prefetched in get_queryset
         return ", ".join([group.name for group in obj.groups.all()])
 
     get_groups.short_description = "Groups"  # type: ignore
@@ -90,7 +94,7 @@ class CustomUserAdmin(UserAdmin, ModelAdmin):
                 obj.save()
 
     def get_queryset(self, request):
-        qs = super().get_queryset(request)
+        qs = super().get_queryset(request).prefetch_related("groups")
         if request.user.is_superuser:
             return qs
         # Users can only see users in their groups or with lower permissions
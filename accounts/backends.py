@@ -1,16 +1,15 @@
 # accounts/backends.py
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
 
 
 class EmailOrUsernameModelBackend(ModelBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
         try:
-            # Try to fetch the user
-            user = User.objects.get(
-                Q(username__iexact=username) | Q(email__iexact=username)
-            )
+            user = self.login_queryset(username).get()
             # Check if the password is correct
             if user.check_password(password):
                 return user
@@ -18,6 +17,17 @@ class EmailOrUsernameModelBackend(ModelBackend):
         except User.DoesNotExist:
             return None
 
+    def login_queryset(self, username):
+        """Users whose username or email matches ``username`` case-insensitively.
+
+        lower() is applied to both sides so the lookup can use the
+        lower(username) / lower(email) indexes.
+        """
+        login = Lower(Value(username))
+        return User.objects.filter(
+            Exact(Lower("username"), login) | Exact(Lower("email"), login)
+        )
+
     def get_user(self, user_id):
         try:
             return User.objects.get(pk=user_id)
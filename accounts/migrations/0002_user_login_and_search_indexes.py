@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from core.indexes import CreateRawIndexes, lower_index, trigram_index
+
+
+class Migration(migrations.Migration):
+    # PostgreSQL builds these CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        # After the last auth.User change: SQLite rebuilds altered tables and
+        # would drop indexes it does not know about
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        CreateRawIndexes(
+            [
+                # EmailOrUsernameModelBackend matches lower(username/email)
+                lower_index("auth_user_username_lower_idx", "auth_user", "username"),
+                lower_index("auth_user_email_lower_idx", "auth_user", "email"),
+                # Admin search over users, bookings and notifications
+                trigram_index("auth_user_username_trgm_idx", "auth_user", "username"),
+                trigram_index("auth_user_email_trgm_idx", "auth_user", "email"),
+            ]
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from core.indexes import CreateRawIndexes, lower_prefix_index
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0002_user_login_and_search_indexes"),
+    ]
+
+    operations = [
+        CreateRawIndexes(
+            [
+                # Admin autocomplete matches lower(username) by prefix
+                lower_prefix_index(
+                    "auth_user_username_lower_prefix_idx", "auth_user", "username"
+                ),
+            ]
+        ),
+    ]
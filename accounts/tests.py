@@ -1,9 +1,12 @@
 # accounts/tests.py
 import pytest
 from django.contrib.auth.models import Group, Permission, User
+from django.db import connection
 from django.test import Client
 from django.urls import reverse
 
+from .backends import EmailOrUsernameModelBackend
+
 
 @pytest.fixture
 def client():
@@ -133,3 +136,44 @@ class TestUserProfile:
         updated_user = User.objects.get(id=test_user.id)
         assert updated_user.first_name == "Updated"
         assert updated_user.last_name == "Name"
+
+
+@pytest.mark.django_db
+class TestLoginLookup:
+    @pytest.fixture
+    def seeded_users(self):
+        User.objects.bulk_create(
+            User(username=f"Guest{n:05d}", email=f"guest{n:05d}@example.com")
+            for n in range(2000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_login_is_case_insensitive(self, client, test_user):
+        """Test guests can log in with any casing of username or email"""
+        backend = EmailOrUsernameModelBackend()
+
+        assert backend.authenticate(None, "TestUser", "testpass123") == test_user
+        assert (
+            backend.authenticate(None, "TEST@example.com", "testpass123") == test_user
+        )
+        assert backend.authenticate(None, "nobody", "testpass123") is None
+
+    def test_login_lookup_uses_lower_indexes(self, seeded_users):
+        """Test the username/email lookup is served by the lower() indexes"""
+        plan = EmailOrUsernameModelBackend().login_queryset("GUEST01234").explain()
+
+        assert "auth_user_username_lower_idx" in plan
+        assert "auth_user_email_lower_idx" in plan
+        assert "SCAN auth_user" not in plan and "Seq Scan" not in plan
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="pg_trgm is PostgreSQL only"
+    )
+    def test_admin_search_uses_trigram_index(self, seeded_users):
+        """Test icontains searches can use the pg_trgm indexes"""
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = User.objects.filter(email__icontains="st0123").explain()
+
+        assert "auth_user_email_trgm_idx" in plan
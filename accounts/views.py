@@ -58,17 +58,20 @@ class ProfileView(LoginRequiredMixin, DetailView):
     context_object_name = "profile"
 
     def get_object(self):
-        # Ensure profile exists
-        UserProfile.objects.get_or_create(user=self.request.user)
-        return self.request.user
+        # Ensure profile exists and cache it on the user for the template
+        user = self.request.user
+        user.profile, _ = UserProfile.objects.get_or_create(user=user)
+        return user
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["user_profile"] = self.request.user.profile  # Add profile to context
         # Add recent bookings if you have them
-        context["recent_bookings"] = self.request.user.booking_set.order_by(
-            "-created_at"
-        )[:5]
+        context["recent_bookings"] = list(
+            self.request.user.booking_set.select_related("room").order_by(
+                "-created_at"
+            )[:5]
+        )
         return context
 
 
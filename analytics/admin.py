@@ -1,15 +1,19 @@
+import logging
 from datetime import timedelta
 
 from django.contrib import admin
-from django.db.models import Count, Sum
-from django.db.models.functions import TruncMonth
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from unfold.admin import ModelAdmin
 
 from bookings.models import Booking
-from rooms.models import Room
+from core.db_router import read_from_replica
+from core.instrumentation import timer
 
 from .models import BookingStatistics
+from .series import current_series, monthly_series
+
+logger = logging.getLogger(__name__)
 
 
 @admin.register(BookingStatistics)
@@ -26,6 +30,8 @@ class BookingStatisticsAdmin(ModelAdmin):
     list_filter = ["date"]
     ordering = ["-date"]
 
+    @method_decorator(read_from_replica)
+    @timer("analytics")
     def changelist_view(self, request, extra_context=None):
         extra_context = extra_context or {}
 
@@ -53,77 +59,18 @@ class BookingStatisticsAdmin(ModelAdmin):
             # Sort years in descending order
             available_years.sort(reverse=True)
 
-            # Set date range for selected year
-            start_date = timezone.datetime(selected_year, 1, 1).date()
-            end_date = timezone.datetime(selected_year, 12, 31).date()
-
-            # Get monthly stats
-            monthly_stats = (
-                Booking.objects.filter(
-                    check_in__gte=start_date,
-                    check_in__lte=end_date,
-                    status__in=["confirmed", "completed"],
-                )
-                .annotate(month=TruncMonth("check_in"))
-                .values("month")
-                .annotate(revenue=Sum("total_price", default=0), bookings=Count("id"))
-                .order_by("month")
-            )
-
-            # Initialize all months
-            months = [
-                {
-                    "month": timezone.datetime(selected_year, month, 1).date(),
-                    "revenue": 0,
-                    "bookings": 0,
-                }
-                for month in range(1, 13)
-            ]
-
-            # Update with actual data
-            stats_dict = {stat["month"]: stat for stat in monthly_stats}
-            for month in months:
-                if month["month"] in stats_dict:
-                    month["revenue"] = float(stats_dict[month["month"]]["revenue"])
-                    month["bookings"] = stats_dict[month["month"]]["bookings"]
-
-            # Prepare chart data
+            series = monthly_series(selected_year)
             chart_data = {
-                "labels": [month["month"].strftime("%B %Y") for month in months],
-                "revenue": [month["revenue"] for month in months],
-                "bookings": [month["bookings"] for month in months],
+                "labels": series["labels"],
+                "revenue": series["revenue"],
+                "bookings": series["bookings"],
             }
-
-            # Calculate occupancy if rooms exist
-            total_rooms = Room.objects.filter(is_active=True).count()
-            if total_rooms > 0:
-                occupancy_stats = (
-                    Booking.objects.filter(
-                        check_in__gte=start_date,
-                        check_in__lte=end_date,
-                        status__in=["confirmed", "completed"],
-                    )
-                    .annotate(month=TruncMonth("check_in"))
-                    .values("month")
-                    .annotate(occupied_rooms=Count("room", distinct=True))
-                    .order_by("month")
-                )
-
-                occupancy_data = {"labels": chart_data["labels"], "rates": []}
-
-                # Create occupancy stats dictionary
-                occupancy_dict = {
-                    stat["month"]: stat["occupied_rooms"] for stat in occupancy_stats
+            if series["occupancy"] is not None:
+                extra_context["occupancy_data"] = {
+                    "labels": series["labels"],
+                    "rates": series["occupancy"],
                 }
 
-                # Calculate rates for all months
-                for month in months:
-                    occupied = occupancy_dict.get(month["month"], 0)
-                    rate = (occupied / total_rooms) * 100
-                    occupancy_data["rates"].append(round(rate, 2))
-
-                extra_context["occupancy_data"] = occupancy_data
-
             # Update context
             extra_context.update(
                 {
@@ -134,7 +81,7 @@ class BookingStatisticsAdmin(ModelAdmin):
             )
 
         except Exception as e:
-            print(f"Error in changelist_view: {e}")
+            logger.exception("Error in changelist_view: %s", e)
             # Provide default empty data
             extra_context.update(
                 {
@@ -147,86 +94,25 @@ class BookingStatisticsAdmin(ModelAdmin):
 
         return super().changelist_view(request, extra_context=extra_context)
 
+    @timer("analytics")
     def get_chart_data(self):
         try:
-            # Default to current year
-            selected_year = timezone.now().year
-
-            # Set date range for selected year
-            start_date = timezone.datetime(selected_year, 1, 1).date()
-            end_date = timezone.datetime(selected_year, 12, 31).date()
-
-            # Get monthly stats
-            monthly_stats = (
-                Booking.objects.filter(
-                    check_in__gte=start_date,
-                    check_in__lte=end_date,
-                    status__in=["confirmed", "completed"],
-                )
-                .annotate(month=TruncMonth("check_in"))
-                .values("month")
-                .annotate(revenue=Sum("total_price", default=0), bookings=Count("id"))
-                .order_by("month")
-            )
-
-            # Initialize all months
-            months = [
-                {
-                    "month": timezone.datetime(selected_year, month, 1).date(),
-                    "revenue": 0,
-                    "bookings": 0,
-                }
-                for month in range(1, 13)
-            ]
-
-            # Update with actual data
-            stats_dict = {stat["month"]: stat for stat in monthly_stats}
-            for month in months:
-                if month["month"] in stats_dict:
-                    month["revenue"] = float(stats_dict[month["month"]]["revenue"])
-                    month["bookings"] = stats_dict[month["month"]]["bookings"]
-
-            # Prepare chart data
+            series = current_series(timezone.now().year)
             chart_data = {
-                "labels": [month["month"].strftime("%B %Y") for month in months],
-                "revenue": [month["revenue"] for month in months],
-                "bookings": [month["bookings"] for month in months],
+                "labels": series["labels"],
+                "revenue": series["revenue"],
+                "bookings": series["bookings"],
             }
-
-            # Calculate occupancy
-            total_rooms = Room.objects.filter(is_active=True).count()
-            if total_rooms > 0:
-                occupancy_stats = (
-                    Booking.objects.filter(
-                        check_in__gte=start_date,
-                        check_in__lte=end_date,
-                        status__in=["confirmed", "completed"],
-                    )
-                    .annotate(month=TruncMonth("check_in"))
-                    .values("month")
-                    .annotate(occupied_rooms=Count("room", distinct=True))
-                    .order_by("month")
-                )
-
-                occupancy_data = {"labels": chart_data["labels"], "rates": []}
-
-                # Create occupancy stats dictionary
-                occupancy_dict = {
-                    stat["month"]: stat["occupied_rooms"] for stat in occupancy_stats
+            if series["occupancy"] is not None:
+                chart_data["occupancy_data"] = {
+                    "labels": series["labels"],
+                    "rates": series["occupancy"],
                 }
 
-                # Calculate rates for all months
-                for month in months:
-                    occupied = occupancy_dict.get(month["month"], 0)
-                    rate = (occupied / total_rooms) * 100
-                    occupancy_data["rates"].append(round(rate, 2))
-
-                chart_data["occupancy_data"] = occupancy_data
-
             return {"chart_data": chart_data}
 
         except Exception as e:
-            print(f"Error in get_chart_data: {e}")
+            logger.exception("Error in get_chart_data: %s", e)
             return {
                 "chart_data": {
                     "labels": [],
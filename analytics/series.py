@@ -0,0 +1,72 @@
+# analytics/series.py
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from bookings.models import Booking
+from core.cache import memoize, stale_while_revalidate
+from core.db_router import replica_reads
+from rooms.models import Room
+
+REPORTED_STATUSES = ("confirmed", "completed")
+
+
+@memoize("analytics", tags=["bookings", "rooms"])
+def monthly_series(year):
+    """Revenue, bookings and occupancy per month of ``year`` for the charts.
+
+    ``occupancy`` is None when there are no active rooms. Cached in the
+    analytics namespace until a booking or room changes.
+    """
+    months = [timezone.datetime(year, month, 1).date() for month in range(1, 13)]
+    stats = {
+        stat["month"]: stat
+        for stat in Booking.objects.filter(
+            check_in__year=year, status__in=REPORTED_STATUSES
+        )
+        .annotate(month=TruncMonth("check_in"))
+        .values("month")
+        .annotate(
+            revenue=Sum("total_price", default=0),
+            bookings=Count("id"),
+            occupied_rooms=Count("room", distinct=True),
+        )
+        .order_by("month")
+    }
+
+    total_rooms = Room.objects.filter(is_active=True).count()
+    empty = {"revenue": 0, "bookings": 0, "occupied_rooms": 0}
+    return {
+        "labels": [month.strftime("%B %Y") for month in months],
+        "revenue": [float(stats.get(month, empty)["revenue"]) for month in months],
+        "bookings": [stats.get(month, empty)["bookings"] for month in months],
+        "occupancy": (
+            [
+                round(stats.get(month, empty)["occupied_rooms"] / total_rooms * 100, 2)
+                for month in months
+            ]
+            if total_rooms
+            else None
+        ),
+    }
+
+
+def current_series(year):
+    """``monthly_series`` for the charts, served stale while it is refreshed.
+
+    Unlike the memoized series, which drops out on every booking, this is
+    only recomputed every ``ANALYTICS_CACHE_TTL`` seconds, by one worker.
+    """
+
+    def compute():
+        with replica_reads():
+            return monthly_series(year)
+
+    return stale_while_revalidate(
+        f"analytics:series:{year}",
+        compute,
+        settings.ANALYTICS_CACHE_TTL,
+        cache=caches["analytics"],
+    )
@@ -143,6 +143,39 @@ class TestBookingStatistics:
         assert all(bookings == 0 for bookings in data["chart_data"]["bookings"])
 
 
+@pytest.mark.django_db
+class TestStaleWhileRevalidate:
+    def test_year_data_served_stale_while_refreshing(
+        self, client, monkeypatch, settings, staff_user, sample_bookings
+    ):
+        """Test expired year data is served once more while one refresh runs"""
+        refreshes = []
+        monkeypatch.setattr(
+            "core.cache.run_in_background", lambda func: refreshes.append(func)
+        )
+        settings.ANALYTICS_CACHE_TTL = 0
+        client.login(username="staff", password="staff123")
+        url = reverse("analytics:year_data", kwargs={"year": 2024})
+        assert client.get(url).json()["chart_data"]["bookings"][0] == 2
+
+        Booking.objects.create(
+            user=staff_user,
+            room=sample_bookings[0].room,
+            check_in=date(2024, 1, 20),
+            check_out=date(2024, 1, 22),
+            adults=1,
+            status="confirmed",
+            total_price=Decimal("200.00"),
+        )
+        assert client.get(url).json()["chart_data"]["bookings"][0] == 2
+        assert client.get(url).json()["chart_data"]["bookings"][0] == 2
+        assert len(refreshes) == 1
+
+        refreshes[0]()
+        settings.ANALYTICS_CACHE_TTL = 60
+        assert client.get(url).json()["chart_data"]["bookings"][0] == 3
+
+
 @pytest.mark.django_db
 class TestAnalyticsPerformance:
     def test_large_dataset_handling(self, client, staff_user, test_room):
@@ -4,6 +4,8 @@ from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from unfold.admin import ModelAdmin
 
+from core.paginator import EstimatedCountPaginator
+
 from .models import Booking
 
 
@@ -19,9 +21,13 @@ class BookingAdmin(ModelAdmin):
         "created_at",
         "view_analytics",  # Add analytics link column
     ]
+    list_select_related = ["user", "room"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_filter = ["status", "created_at", "check_in", "check_out"]
     search_fields = ["user__email", "user__username", "room__name", "room__room_number"]
     readonly_fields = ["created_at", "updated_at", "total_price"]
+    autocomplete_fields = ["user", "room"]
 
     fieldsets = (
         (
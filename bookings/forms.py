@@ -4,6 +4,8 @@ from datetime import datetime
 from django import forms
 from django.core.exceptions import ValidationError
 
+from core.instrumentation import timer
+
 from .models import Booking
 
 
@@ -87,19 +89,23 @@ class BookingCreateForm(forms.ModelForm):
                     raise ValidationError("Number of children exceeds room capacity")
 
                 # Check availability
-                overlapping_bookings = Booking.objects.filter(
-                    room=self.room,
-                    check_in__lt=check_out,
-                    check_out__gt=check_in,
-                    status__in=["pending", "confirmed"],
-                ).exclude(pk=self.instance.pk if self.instance else None)
+                with timer("availability"):
+                    overlapping_bookings = Booking.objects.filter(
+                        room=self.room,
+                        check_in__lt=check_out,
+                        check_out__gt=check_in,
+                        status__in=["pending", "confirmed"],
+                    ).exclude(pk=self.instance.pk if self.instance else None)
 
-                if overlapping_bookings.exists():
-                    raise ValidationError("Room is not available for selected dates")
+                    if overlapping_bookings.exists():
+                        raise ValidationError(
+                            "Room is not available for selected dates"
+                        )
 
                 # Calculate total price
-                days = (check_out - check_in).days
-                self.instance.total_price = self.room.price_per_night * days
+                with timer("pricing"):
+                    days = (check_out - check_in).days
+                    self.instance.total_price = self.room.price_per_night * days
 
         return cleaned_data
 
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+from core.indexes import POSTGRES, CreateRawIndexes, RawIndex
+
+
+class Migration(migrations.Migration):
+    # PostgreSQL builds the raw indexes CONCURRENTLY
+    atomic = False
+
+    dependencies = [
+        ("bookings", "0002_alter_booking_adults_alter_booking_children"),
+        ("rooms", "0002_room_search_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["user", "-created_at"], name="booking_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["user", "status", "-created_at"], name="booking_user_status_idx"
+            ),
+        ),
+        CreateRawIndexes(
+            [
+                # Overlap checks in Booking.clean() and the availability
+                # endpoints only ever look at pending/confirmed stays
+                RawIndex(
+                    "booking_active_overlap_idx",
+                    "bookings_booking",
+                    '"room_id", "check_in", "check_out"',
+                    where="\"status\" IN ('pending', 'confirmed')",
+                ),
+                # Analytics and reports over check-in ranges of actual stays
+                RawIndex(
+                    "booking_stay_check_in_idx",
+                    "bookings_booking",
+                    '"check_in"',
+                    where="\"status\" IN ('confirmed', 'completed')",
+                ),
+                # created_at follows insertion order, so a BRIN index is a few
+                # pages yet prunes the dashboard's and admin's date ranges
+                RawIndex(
+                    "booking_created_brin_idx",
+                    "bookings_booking",
+                    '"created_at"',
+                    using="brin",
+                    vendors=POSTGRES,
+                ),
+            ]
+        ),
+    ]
@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
+from core import metrics
 from rooms.models import Room
 
 
@@ -31,6 +32,17 @@ class Booking(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        # Partial and BRIN indexes are created in migration 0003 (core.indexes)
+        indexes = [
+            # BookingListView, with and without its status filter
+            models.Index(
+                fields=["user", "-created_at"], name="booking_user_created_idx"
+            ),
+            models.Index(
+                fields=["user", "status", "-created_at"],
+                name="booking_user_status_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Booking {self.id} - {self.user.username} - {self.room.name}"
@@ -67,6 +79,7 @@ class Booking(models.Model):
             ).exclude(pk=self.pk)
 
             if overlapping_bookings.exists():
+                metrics.BOOKING_CONFLICTS.inc()
                 raise ValidationError("Room is not available for selected dates")
 
     def calculate_total_price(self):
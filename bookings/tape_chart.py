@@ -0,0 +1,90 @@
+# bookings/tape_chart.py
+from array import array
+from datetime import timedelta
+
+from rooms.models import Room
+
+from .models import Booking
+
+DAY_SPANS = (30, 60, 90)
+ROOMS_PER_PAGE = 50
+SHOWN_STATUSES = ("pending", "confirmed", "completed")
+
+
+def room_page(after=None, limit=ROOMS_PER_PAGE):
+    """Active rooms after room number ``after``, plus whether more follow"""
+    rooms = Room.objects.filter(is_active=True).order_by("room_number")
+    if after:
+        rooms = rooms.filter(room_number__gt=after)
+    rooms = list(rooms.only("pk", "name", "room_number", "room_type")[: limit + 1])
+    return rooms[:limit], len(rooms) > limit
+
+
+def pack_nights(rooms, stays, start, days):
+    """Pack stays into one ``rooms x days`` array of 1-based stay indexes.
+
+    Cell ``row * days + day`` holds the stay occupying that room on the night
+    of ``start + day``, or 0 if the room is free.
+    """
+    rows = {room.pk: row for row, room in enumerate(rooms)}
+    nights = array("I", bytes(4 * len(rooms) * days))
+    for number, stay in enumerate(stays, 1):
+        offset = rows[stay["room_id"]] * days
+        first = max((stay["check_in"] - start).days, 0)
+        last = min((stay["check_out"] - start).days, days)
+        nights[offset + first : offset + last] = array("I", [number]) * (last - first)
+    return nights
+
+
+def row_cells(nights, stays, offset, days):
+    """Run-length encode one room's nights into free days and stay spans"""
+    cells = []
+    day = 0
+    while day < days:
+        number = nights[offset + day]
+        length = 1
+        while day + length < days and nights[offset + day + length] == number:
+            length += 1
+        cells.extend(
+            [{"stay": None}] * length
+            if not number
+            else [{"stay": stays[number - 1], "length": length}]
+        )
+        day += length
+    return cells
+
+
+def build_tape_chart(start, days, after=None):
+    """Rooms x nights grid for the front desk, from one bookings query.
+
+    Stays are fetched with a single date-bounded interval query over the page
+    of rooms, packed by ``pack_nights`` and expanded into table cells per room.
+    ``next_after`` is the keyset cursor for the following page of rooms.
+    """
+    end = start + timedelta(days=days)
+    rooms, has_more = room_page(after)
+    stays = list(
+        Booking.objects.filter(
+            room__in=[room.pk for room in rooms],
+            status__in=SHOWN_STATUSES,
+            check_in__lt=end,
+            check_out__gt=start,
+        )
+        .order_by("check_in", "pk")
+        .values("pk", "room_id", "check_in", "check_out", "status", "user__username")
+    )
+    for stay in stays:
+        stay["arrives"] = stay["check_in"] >= start
+        stay["departs"] = stay["check_out"] <= end
+
+    nights = pack_nights(rooms, stays, start, days)
+    return {
+        "start": start,
+        "end": end,
+        "days": [start + timedelta(days=day) for day in range(days)],
+        "rows": [
+            {"room": room, "cells": row_cells(nights, stays, row * days, days)}
+            for row, room in enumerate(rooms)
+        ],
+        "next_after": rooms[-1].room_number if has_more else None,
+    }
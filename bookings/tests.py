@@ -4,12 +4,17 @@ from decimal import Decimal
 import pytest
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
+from core.seeding import seed_hotel
 from rooms.models import Room
 
 from .models import Booking
+from .tape_chart import ROOMS_PER_PAGE
 
 
 @pytest.fixture
@@ -296,3 +301,195 @@ class TestBookingModel:
 
         expected_price = test_room.price_per_night * 2  # 2 nights
         assert booking.total_price == expected_price
+
+
+@pytest.mark.django_db
+class TestTapeChart:
+    @pytest.fixture
+    def staff_client(self, client):
+        staff = User.objects.create_user(
+            username="desk", password="desk123", is_staff=True
+        )
+        client.force_login(staff)
+        return client
+
+    def test_tape_chart_requires_staff(self, client, test_user):
+        """Test guests cannot open the tape chart"""
+        client.login(username="testuser", password="testpass123")
+        response = client.get(reverse("bookings:tape_chart"))
+
+        assert response.status_code == 403
+
+    def test_tape_chart_spans(self, staff_client, test_user, test_room):
+        """Test stays are clipped to the window and flag arrivals/departures"""
+        start = date(2030, 1, 1)
+        Booking.objects.bulk_create(
+            [
+                Booking(
+                    user=test_user,
+                    room=test_room,
+                    check_in=start - timedelta(days=2),
+                    check_out=start + timedelta(days=3),
+                    adults=1,
+                    status="confirmed",
+                    total_price=Decimal("500.00"),
+                ),
+                Booking(
+                    user=test_user,
+                    room=test_room,
+                    check_in=start + timedelta(days=5),
+                    check_out=start + timedelta(days=7),
+                    adults=1,
+                    status="pending",
+                    total_price=Decimal("200.00"),
+                ),
+                Booking(
+                    user=test_user,
+                    room=test_room,
+                    check_in=start + timedelta(days=10),
+                    check_out=start + timedelta(days=12),
+                    adults=1,
+                    status="cancelled",
+                    total_price=Decimal("200.00"),
+                ),
+            ]
+        )
+
+        response = staff_client.get(
+            reverse("bookings:tape_chart"), {"start": "2030-01-01", "days": 30}
+        )
+
+        assert response.status_code == 200
+        cells = response.context["rows"][0]["cells"]
+        spans = [cell for cell in cells if cell["stay"]]
+        assert sum(cell.get("length", 1) for cell in cells) == 30
+        assert [cell["length"] for cell in spans] == [3, 2]
+        # Nights 0-2 booked, 3-4 free, 5-6 booked
+        assert [cells.index(cell) for cell in spans] == [0, 3]
+        assert not spans[0]["stay"]["arrives"] and spans[0]["stay"]["departs"]
+        assert spans[1]["stay"]["arrives"]
+
+    def test_tape_chart_pages_rooms_over_htmx(self, staff_client, test_room):
+        """Test room rows load in keyset pages with one bookings query each"""
+        for number in range(ROOMS_PER_PAGE + 5):
+            Room.objects.create(
+                name=f"Room {number}",
+                room_number=f"2{number:02d}",
+                floor=2,
+                room_type="single",
+                bed_type="single",
+                price_per_night=Decimal("80.00"),
+                capacity_adults=1,
+                capacity_children=0,
+            )
+
+        response = staff_client.get(reverse("bookings:tape_chart"), {"days": 90})
+        assert len(response.context["rows"]) == ROOMS_PER_PAGE
+        assert len(response.context["days"]) == 90
+        after = response.context["next_after"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = staff_client.get(
+                reverse("bookings:tape_chart"),
+                {"days": 90, "after": after},
+                headers={"HX-Request": "true"},
+            )
+
+        assert [row["room"].room_number for row in response.context["rows"]] == [
+            f"2{number:02d}" for number in range(ROOMS_PER_PAGE - 1, ROOMS_PER_PAGE + 5)
+        ]
+        assert response.context["next_after"] is None
+        assert b"<table" not in response.content
+        assert sum("bookings_booking" in query["sql"] for query in queries) == 1
+
+    def test_history_restore_renders_full_page(self, staff_client, test_room):
+        """Test Back/Forward after paging the window gets the whole page"""
+        url = reverse("bookings:tape_chart")
+        params = {"start": "2030-02-01", "days": 30}
+
+        partial = staff_client.get(url, params, headers={"HX-Request": "true"})
+        restored = staff_client.get(
+            url,
+            params,
+            headers={"HX-Request": "true", "HX-History-Restore-Request": "true"},
+        )
+
+        assert b"<html" not in partial.content
+        assert b"<html" in restored.content
+        assert "HX-Request" in restored["Vary"]
+
+
+# Smaller tables may legitimately be read with a sequential scan
+FULL_SCAN_ROW_THRESHOLD = 1000
+
+
+def full_scans(queryset):
+    """Plan lines reading the whole bookings table"""
+    plan = queryset.explain()
+    marker = (
+        "Seq Scan on bookings_booking"
+        if "Seq Scan" in plan
+        else "SCAN bookings_booking"
+    )
+    return [line for line in plan.splitlines() if marker in line]
+
+
+@pytest.mark.django_db
+class TestBookingQueryPlans:
+    @pytest.fixture(autouse=True)
+    def seeded(self):
+        seed_hotel(rooms=20, bookings=5000, years=1, seed=1, notifications=False)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        assert Booking.objects.count() > FULL_SCAN_ROW_THRESHOLD
+
+    @pytest.fixture
+    def guest(self):
+        return Booking.objects.values_list("user", flat=True).first()
+
+    def hot_queries(self, guest):
+        room = Room.objects.order_by("pk").first()
+        today = timezone.now().date()
+        stays = Booking.objects.filter(
+            check_in__gte=today - timedelta(days=30),
+            check_in__lte=today,
+            status__in=["confirmed", "completed"],
+        )
+        return {
+            "overlap check": Booking.objects.filter(
+                room=room,
+                check_in__lt=today + timedelta(days=3),
+                check_out__gt=today,
+                status__in=["pending", "confirmed"],
+            ),
+            "booking list": Booking.objects.filter(user=guest).select_related("room"),
+            "booking list by status": Booking.objects.filter(
+                user=guest, status="confirmed"
+            ).select_related("room"),
+            "analytics range": stays,
+            "analytics revenue": stays.values("check_in").annotate(
+                total=Sum("total_price")
+            ),
+        }
+
+    def test_hot_queries_avoid_full_scans(self, guest):
+        """Test every hot bookings query is answered from an index"""
+        scans = {
+            name: full_scans(queryset)
+            for name, queryset in self.hot_queries(guest).items()
+        }
+
+        assert scans == {name: [] for name in scans}
+
+    def test_overlap_check_uses_partial_index(self):
+        """Test the availability check reads the active-stay partial index"""
+        room = Room.objects.order_by("pk").first()
+        today = timezone.now().date()
+        plan = Booking.objects.filter(
+            room=room,
+            check_in__lt=today + timedelta(days=3),
+            check_out__gt=today,
+            status__in=["pending", "confirmed"],
+        ).explain()
+
+        assert "booking_active_overlap_idx" in plan
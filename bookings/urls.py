@@ -13,6 +13,7 @@ urlpatterns = [
         views.BookingCreateView.as_view(),
         name="booking_create",
     ),
+    path("tape-chart/", views.TapeChartView.as_view(), name="tape_chart"),
     path("<int:pk>/cancel/", views.BookingCancelView.as_view(), name="booking_cancel"),
     path(
         "check-availability/<int:room_pk>/",
@@ -2,16 +2,29 @@ import json
 from datetime import datetime, timedelta
 
 from django.contrib import messages
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, DetailView, ListView, UpdateView
-
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.views.generic import (
+    CreateView,
+    DetailView,
+    ListView,
+    TemplateView,
+    UpdateView,
+)
+
+from core import metrics
+from core.htmx import is_htmx_partial
+from core.instrumentation import timer
+from core.singleflight import coalesce
 from rooms.models import Room
 
 from .forms import BookingCreateForm
 from .models import Booking
+from .tape_chart import DAY_SPANS, build_tape_chart
 
 
 class BookingCreateView(LoginRequiredMixin, CreateView):
@@ -51,6 +64,7 @@ class BookingCreateView(LoginRequiredMixin, CreateView):
         context["booked_dates"] = json.dumps(booked_dates)
         return context
 
+    @timer("booking")
     def form_valid(self, form):
         print("\nForm validation succeeded:")
         print(f"Form cleaned data: {form.cleaned_data}")
@@ -115,12 +129,54 @@ class BookingCancelView(LoginRequiredMixin, UpdateView):
     def form_valid(self, form):
         if self.object.can_be_cancelled:
             self.object.status = "cancelled"
+            metrics.BOOKINGS_CANCELLED.inc()
             messages.success(self.request, "Booking cancelled successfully.")
             return super().form_valid(form)
         messages.error(self.request, "This booking cannot be cancelled.")
         return redirect("bookings:booking_detail", pk=self.object.pk)
 
 
+class TapeChartView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    """Front-desk grid of rooms by night.
+
+    HTMX requests get the chart alone when the date window changes, or just the
+    next page of room rows (``after``) when the last loaded row scrolls in.
+    """
+
+    template_name = "bookings/tape_chart.html"
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get_template_names(self):
+        if not is_htmx_partial(self.request):
+            return [self.template_name]
+        if self.request.GET.get("after"):
+            return ["bookings/partials/tape_chart_rows.html"]
+        return ["bookings/partials/tape_chart.html"]
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        # Pushed URLs serve the full page and the partial at the same address
+        patch_vary_headers(response, ["HX-Request"])
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            start = datetime.strptime(self.request.GET["start"], "%Y-%m-%d").date()
+        except (KeyError, ValueError):
+            start = timezone.localdate()
+        days = self.request.GET.get("days", "")
+        days = int(days) if days.isdigit() and int(days) in DAY_SPANS else DAY_SPANS[0]
+
+        context.update(build_tape_chart(start, days, self.request.GET.get("after")))
+        context["day_spans"] = DAY_SPANS
+        context["span"] = days
+        context["previous_start"] = start - timedelta(days=days)
+        return context
+
+
 def check_availability(request, room_pk):
     """HTMX endpoint to check room availability"""
     check_in = request.GET.get("check_in")
@@ -146,15 +202,23 @@ def check_availability(request, room_pk):
     except ValueError:
         return JsonResponse({"available": False, "message": "Invalid dates"})
 
-    overlapping_bookings = Booking.objects.filter(
-        room_id=room_pk,
-        status__in=[
-            "pending",
-            "confirmed",
-        ],  # Only check pending and confirmed bookings
-        check_in__lt=check_out,
-        check_out__gt=check_in,
-    ).exists()
+    with timer("availability"):
+        # Every date change fires a request; identical concurrent ones share
+        # a single query
+        overlapping_bookings = coalesce(
+            "availability",
+            f"{room_pk}:{check_in}:{check_out}",
+            lambda: Booking.objects.filter(
+                room_id=room_pk,
+                status__in=[
+                    "pending",
+                    "confirmed",
+                ],  # Only check pending and confirmed bookings
+                check_in__lt=check_out,
+                check_out__gt=check_in,
+            ).exists(),
+            tags=[f"availability:{room_pk}"],
+        )
 
     return JsonResponse(
         {
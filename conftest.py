@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Cached pages and fragments must not leak between tests"""
+    for cache in caches.all():
+        cache.clear()
+    yield
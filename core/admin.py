@@ -2,6 +2,7 @@ from django.contrib import admin
 from unfold.admin import ModelAdmin
 
 from .models import Contact, Notification
+from .paginator import EstimatedCountPaginator
 
 
 @admin.register(Contact)
@@ -10,11 +11,16 @@ class ContactAdmin(ModelAdmin):
     list_filter = ["resolved", "created_at"]
     search_fields = ["name", "email", "subject", "message"]
     readonly_fields = ["created_at"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Notification)
 class NotificationAdmin(ModelAdmin):
     list_display = ["title", "user", "type", "read", "created_at"]
+    list_select_related = ["user"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_filter = ["type", "read", "created_at"]
     search_fields = ["title", "message", "user__username", "user__email"]
     readonly_fields = ["created_at"]
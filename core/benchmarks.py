@@ -0,0 +1,223 @@
+# core/benchmarks.py
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from itertools import count
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.client import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from analytics.views import get_year_data
+from rooms.models import Room
+
+from .instrumentation import QueryRecorder
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    """Register ``func(context)`` as one timed operation of the suite"""
+
+    def decorator(func):
+        SCENARIOS[name] = func
+        return func
+
+    return decorator
+
+
+class BenchmarkContext:
+    """Clients, users and dates shared by every scenario of a run"""
+
+    def __init__(self):
+        self.today = timezone.localdate()
+        self.room = Room.objects.filter(is_active=True).order_by("pk").first()
+        self.admin = User.objects.filter(username="bench-admin").first()
+        if self.admin is None:
+            self.admin = User.objects.create_superuser(
+                "bench-admin", "bench-admin@example.com", None
+            )
+        self.guest, _ = User.objects.get_or_create(username="bench-guest")
+
+        self.anonymous = Client()
+        self.staff = Client()
+        self.staff.force_login(self.admin)
+        self.member = Client()
+        self.member.force_login(self.guest)
+        self.sequence = count()
+
+    def stay(self, offset=30, nights=3):
+        check_in = self.today + timedelta(days=offset)
+        return check_in.isoformat(), (check_in + timedelta(days=nights)).isoformat()
+
+    def get(self, client, url, data=None):
+        response = client.get(url, data)
+        if response.status_code != 200:
+            raise AssertionError(f"GET {url} returned {response.status_code}")
+        return response
+
+
+@scenario("room_list_dates")
+def room_list_dates(context):
+    check_in, check_out = context.stay()
+    context.get(
+        context.anonymous,
+        reverse("rooms:room_list"),
+        {"check_in": check_in, "check_out": check_out, "adults": 2},
+    )
+
+
+@scenario("room_availability")
+def room_availability(context):
+    check_in, check_out = context.stay()
+    context.get(
+        context.anonymous,
+        reverse("rooms:check_availability", kwargs={"pk": context.room.pk}),
+        {"check_in": check_in, "check_out": check_out},
+    )
+
+
+@scenario("booking_availability")
+def booking_availability(context):
+    check_in, check_out = context.stay()
+    context.get(
+        context.anonymous,
+        reverse("bookings:check_availability", kwargs={"room_pk": context.room.pk}),
+        {"check_in": check_in, "check_out": check_out},
+    )
+
+
+@scenario("booking_create")
+def booking_create(context):
+    # Seeded bookings end six months out; every call books a fresh night after that
+    check_in, check_out = context.stay(400 + next(context.sequence) * 2, nights=1)
+    response = context.member.post(
+        reverse("bookings:booking_create", kwargs={"room_pk": context.room.pk}),
+        {"check_in": check_in, "check_out": check_out, "adults": 1, "children": 0},
+    )
+    if response.status_code != 302:
+        raise AssertionError(f"Booking was not created ({response.status_code})")
+
+
+@scenario("dashboard")
+def dashboard(context):
+    context.get(context.staff, reverse("core:dashboard"))
+
+
+@scenario("analytics_changelist")
+def analytics_changelist(context):
+    context.get(context.staff, reverse("admin:analytics_bookingstatistics_changelist"))
+
+
+@scenario("year_data")
+def year_data(context):
+    request = RequestFactory().get("/")
+    request.user = context.admin
+    response = get_year_data(request, context.today.year)
+    if response.status_code != 200:
+        raise AssertionError(f"get_year_data returned {response.status_code}")
+
+
+def measure(func, context, iterations):
+    """Time ``iterations`` calls, then repeat one under tracemalloc for the peak"""
+    func(context)  # warm up URL resolvers, template loaders and the query cache
+
+    timings = []
+    queries = []
+    for _ in range(iterations):
+        with QueryRecorder().record() as recorder:
+            started = time.perf_counter()
+            func(context)
+            timings.append(time.perf_counter() - started)
+        queries.append(recorder.count)
+
+    tracemalloc.start()
+    try:
+        func(context)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "p95_ms": round(timings[int(0.95 * (len(timings) - 1))] * 1000, 3),
+        "min_ms": round(timings[0] * 1000, 3),
+        "queries": max(queries),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(names=None, iterations=20, metadata=None):
+    """Run the selected scenarios against the current database.
+
+    The anonymous page cache, memoization and request coalescing are switched
+    off so every request does its work.
+    """
+    results = {}
+    with override_settings(
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+        PAGE_CACHE_ENABLED=False,
+        MEMOIZE_ENABLED=False,
+        SINGLE_FLIGHT_ENABLED=False,
+    ):
+        context = BenchmarkContext()
+        for name in names or SCENARIOS:
+            results[name] = measure(SCENARIOS[name], context, iterations)
+    return {
+        "meta": {
+            "created": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            **(metadata or {}),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(results, baseline, time_tolerance=0.25, memory_tolerance=0.25):
+    """List regressions of ``results`` against ``baseline``.
+
+    Query counts must not grow at all; median time and peak memory may grow
+    by the given fraction before they count as a regression.
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        if current["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name}: {current['queries']} queries (baseline {previous['queries']})"
+            )
+        if current["median_ms"] > previous["median_ms"] * (1 + time_tolerance):
+            regressions.append(
+                f"{name}: median {current['median_ms']} ms "
+                f"(baseline {previous['median_ms']} ms)"
+            )
+        if current["peak_kb"] > previous["peak_kb"] * (1 + memory_tolerance):
+            regressions.append(
+                f"{name}: peak {current['peak_kb']} KiB "
+                f"(baseline {previous['peak_kb']} KiB)"
+            )
+    return regressions
+
+
+def write_results(results, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n")
+
+
+def read_results(path):
+    return json.loads(path.read_text())
@@ -0,0 +1,289 @@
+# core/cache.py
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import DatabaseError, connections
+from django.utils import timezone
+
+from . import metrics
+from .htmx import is_htmx_partial
+from .instrumentation import timer
+
+PAGE_CACHE_HITS_KEY = "page_cache:hits"
+PAGE_CACHE_MISSES_KEY = "page_cache:misses"
+# Longest a stale value is served, and a refresh may hold its lock
+STALE_TIMEOUT = 60 * 10
+REFRESH_LOCK_TIMEOUT = 60
+
+logger = logging.getLogger("core.cache")
+
+
+def page_cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def tag_key(tag):
+    return f"tag:{tag}"
+
+
+def tag_versions(tags, cache=None):
+    """Return the current version token of each tag, creating missing ones.
+
+    Tokens are random rather than counters so that a tag evicted from the cache
+    can never come back with a version an old entry was stored under.
+    """
+    cache = cache or page_cache()
+    keys = [tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_tags(*tags, cache=None):
+    """Orphan every entry stored under any of ``tags``"""
+    cache = cache or page_cache()
+    cache.set_many({tag_key(tag): uuid.uuid4().hex for tag in tags}, None)
+
+
+def normalized_query(request):
+    """Sorted, empty-value-free query string so equivalent URLs share an entry"""
+    return urlencode(
+        sorted(
+            (key, value)
+            for key, values in request.GET.lists()
+            for value in values
+            if value != ""
+        )
+    )
+
+
+def page_cache_key(request, tags, cache=None):
+    versions = tag_versions(tags, cache)
+    raw = "|".join(
+        [
+            request.path,
+            normalized_query(request),
+            # HTMX requests get a partial of the same URL
+            "htmx" if is_htmx_partial(request) else "",
+            timezone.localdate().isoformat(),
+            *versions,
+        ]
+    )
+    return "page:" + hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def has_messages(request):
+    return len(messages.get_messages(request)) > 0
+
+
+def is_request_cacheable(request):
+    return (
+        settings.PAGE_CACHE_ENABLED
+        and request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        and not has_messages(request)
+    )
+
+
+def is_response_cacheable(request, response):
+    return (
+        response.status_code == 200
+        and not response.cookies
+        and not response.has_header("Set-Cookie")
+        # A rendered CSRF token is bound to this visitor's cookie
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and not has_messages(request)
+    )
+
+
+def record_page_cache(hit):
+    metrics.PAGE_CACHE_REQUESTS.inc(result="hit" if hit else "miss")
+    cache = page_cache()
+    key = PAGE_CACHE_HITS_KEY if hit else PAGE_CACHE_MISSES_KEY
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def page_cache_stats():
+    counts = page_cache().get_many([PAGE_CACHE_HITS_KEY, PAGE_CACHE_MISSES_KEY])
+    hits = counts.get(PAGE_CACHE_HITS_KEY, 0)
+    misses = counts.get(PAGE_CACHE_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def cache_anonymous_page(tags, timeout=None):
+    """Cache the full response for anonymous visitors.
+
+    ``tags`` is a list of tag names or a callable receiving the view arguments;
+    ``invalidate_tags`` drops every page stored under one of them.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if not is_request_cacheable(request):
+                return view_func(request, *args, **kwargs)
+
+            cache = page_cache()
+            page_tags = tags(request, *args, **kwargs) if callable(tags) else tags
+            with timer("cache"):
+                key = page_cache_key(request, page_tags, cache)
+                response = cache.get(key)
+            if response is not None:
+                record_page_cache(hit=True)
+                response["X-Page-Cache"] = "HIT"
+                return response
+
+            record_page_cache(hit=False)
+            response = view_func(request, *args, **kwargs)
+            response["X-Page-Cache"] = "MISS"
+
+            def store(response):
+                if is_response_cacheable(request, response):
+                    with timer("cache"):
+                        cache.set(
+                            key,
+                            response,
+                            settings.PAGE_CACHE_TIMEOUT if timeout is None else timeout,
+                        )
+
+            if hasattr(response, "render") and not response.is_rendered:
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+            return response
+
+        return wrapped
+
+    return decorator
+
+
+MEMO_MISS = object()
+
+
+def memo_key(func, parts, versions):
+    raw = repr((parts, versions))
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return f"memo:{func.__module__}.{func.__qualname__}:{digest}"
+
+
+def memoize(namespace, key=None, tags=(), timeout=DEFAULT_TIMEOUT):
+    """Cache a function's return value in the ``namespace`` cache alias.
+
+    ``key`` receives the call arguments and returns what identifies the result
+    (by default the arguments themselves); returning None skips the cache, e.g.
+    for unsaved instances. ``tags`` is a list or a callable like ``key``, and
+    ``invalidate_memoized(namespace, tag)`` orphans every result stored under
+    that tag. ``timeout`` defaults to the alias's ``TIMEOUT``; results must be
+    picklable. ``MEMOIZE_ENABLED = False`` turns memoization off everywhere.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapped(*args, **kwargs):
+            parts = key(*args, **kwargs) if key else (args, sorted(kwargs.items()))
+            if parts is None or not settings.MEMOIZE_ENABLED:
+                return func(*args, **kwargs)
+
+            cache = caches[namespace]
+            func_tags = tags(*args, **kwargs) if callable(tags) else tags
+            cache_key = memo_key(func, parts, tag_versions(func_tags, cache))
+            value = cache.get(cache_key, MEMO_MISS)
+            if value is MEMO_MISS:
+                value = func(*args, **kwargs)
+                cache.set(cache_key, value, timeout)
+            return value
+
+        return wrapped
+
+    return decorator
+
+
+def invalidate_memoized(namespace, *tags):
+    invalidate_tags(*tags, cache=caches[namespace])
+
+
+def cache_stats():
+    """Per-namespace stats of this process's two-tier caches"""
+    return {
+        namespace: caches[namespace].stats() for namespace in settings.CACHE_NAMESPACES
+    }
+
+
+def run_in_background(func):
+    def target():
+        try:
+            func()
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=target, daemon=True).start()
+
+
+def refresh_lock_key(key):
+    return f"{key}:refreshing"
+
+
+def refresh_cached(key, compute, fresh_for, cache=None):
+    """Recompute the value behind ``key``, store it and release the lock"""
+    cache = cache or page_cache()
+    value = compute()
+    cache.set(key, (time.time() + fresh_for, value), STALE_TIMEOUT)
+    cache.delete(refresh_lock_key(key))
+    return value
+
+
+def refresh_or_keep_stale(key, compute, fresh_for, cache=None):
+    try:
+        refresh_cached(key, compute, fresh_for, cache)
+    except DatabaseError:
+        # Keep serving the stale value; the lock stays until it times out so a
+        # struggling database sees at most one retry per REFRESH_LOCK_TIMEOUT
+        logger.warning("Refreshing %s failed, serving stale data", key, exc_info=True)
+
+
+def stale_while_revalidate(key, compute, fresh_for, cache=None):
+    """Return the cached result of ``compute``, refreshing it once stale.
+
+    Only a cold cache computes inline. For ``fresh_for`` seconds the value is
+    served as is; after that it is still served (for up to ``STALE_TIMEOUT``)
+    while a single background thread, guarded by a lock key in the shared
+    cache, recomputes it. If the refresh hits a database error the stale value
+    keeps being served. ``compute`` runs outside the request, so it must not
+    depend on request state. Like ``memoize`` it is off with
+    ``MEMOIZE_ENABLED = False``.
+    """
+    if not settings.MEMOIZE_ENABLED:
+        return compute()
+
+    cache = cache or page_cache()
+    cached = cache.get(key)
+    if cached is None:
+        return refresh_cached(key, compute, fresh_for, cache)
+
+    fresh_until, value = cached
+    if time.time() >= fresh_until and cache.add(
+        refresh_lock_key(key), True, REFRESH_LOCK_TIMEOUT
+    ):
+        run_in_background(lambda: refresh_or_keep_stale(key, compute, fresh_for, cache))
+    return value
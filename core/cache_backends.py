@@ -0,0 +1,172 @@
+# core/cache_backends.py
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from . import metrics
+
+_MISSING = object()
+# One local tier per namespace and process, shared by all threads
+_local_tiers = {}
+_local_tiers_lock = threading.Lock()
+
+
+class LocalLRU:
+    """Bounded in-process store of pickled values, evicting least recently used"""
+
+    def __init__(self, namespace, max_entries):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires, pickled = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def set(self, key, value, seconds):
+        if seconds <= 0:
+            self.delete(key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (time.monotonic() + seconds, pickled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self.stats["evictions"] += evicted
+        if evicted:
+            metrics.CACHE_EVICTIONS.inc(evicted, cache=self.namespace)
+
+    def delete(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def record(self, result):
+        with self._lock:
+            self.stats[result] += 1
+        metrics.CACHE_REQUESTS.inc(cache=self.namespace, result=result)
+
+
+class TwoTierCache(BaseCache):
+    """Per-process LRU in front of a shared cache alias.
+
+    ``LOCATION`` names the namespace; give each one its own ``KEY_PREFIX`` so
+    namespaces never collide in the shared backend. OPTIONS:
+
+    - ``SHARED_ALIAS``: the cache holding the authoritative copy (``default``)
+    - ``MAX_ENTRIES``: local entries kept before the least recently used go
+    - ``LOCAL_TIMEOUT``: seconds a value is trusted locally; other processes'
+      writes and deletes become visible here after at most this long
+
+    ``incr``/``decr`` go straight to the shared backend so counters stay exact.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.namespace = location
+        self.shared_alias = options.get("SHARED_ALIAS", "default")
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 5)
+        with _local_tiers_lock:
+            self.local = _local_tiers.get(location)
+            if self.local is None:
+                self.local = _local_tiers[location] = LocalLRU(
+                    location, self._max_entries
+                )
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _local_seconds(self, timeout):
+        timeout = self._timeout(timeout)
+        if timeout is None:
+            return self.local_timeout
+        return min(self.local_timeout, timeout)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        value = self.local.get(key)
+        if value is not _MISSING:
+            self.local.record("local_hits")
+            return value
+        value = self.shared.get(key, _MISSING)
+        if value is _MISSING:
+            self.local.record("misses")
+            return default
+        self.local.record("shared_hits")
+        self.local.set(key, value, self.local_timeout)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self.shared.set(key, value, self._timeout(timeout))
+        self.local.set(key, value, self._local_seconds(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        added = self.shared.add(key, value, self._timeout(timeout))
+        if added:
+            self.local.set(key, value, self._local_seconds(timeout))
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self.shared.touch(key, self._timeout(timeout))
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self.local.delete(key)
+        return self.shared.delete(key)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self.local.delete(key)
+        return self.shared.incr(key, delta)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def stats(self):
+        """Hit, miss and eviction counts of this process, plus the local size"""
+        lookups = sum(
+            self.local.stats[result]
+            for result in ("local_hits", "shared_hits", "misses")
+        )
+        hits = self.local.stats["local_hits"] + self.local.stats["shared_hits"]
+        return {
+            **self.local.stats,
+            "local_entries": len(self.local),
+            "max_entries": self.local.max_entries,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,102 @@
+# core/dashboard.py
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum, Value
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+
+from bookings.models import Booking
+from rooms.models import Room
+
+from .cache import refresh_cached, stale_while_revalidate
+from .db_router import replica_reads
+
+SNAPSHOT_KEY = "dashboard:snapshot"
+RECENT_BOOKINGS_KEY = "dashboard:recent_bookings"
+RECENT_BOOKINGS = 5
+WINDOW_DAYS = 30
+OCCUPYING_STATUSES = ("confirmed", "completed")
+
+
+def compute_snapshot():
+    """Dashboard tiles from one aggregate query on rooms and one on bookings.
+
+    Occupancy is booked room-nights over available room-nights for the last
+    ``WINDOW_DAYS`` nights, counting only the part of each stay in the window.
+    """
+    today = timezone.localdate()
+    window_start = today - timedelta(days=WINDOW_DAYS)
+    created_since = timezone.make_aware(
+        datetime.combine(window_start, datetime.min.time())
+    )
+
+    rooms = Room.objects.aggregate(
+        total_rooms=Count("pk"),
+        available_rooms=Count("pk", filter=Q(is_active=True)),
+    )
+
+    nights_in_window = ExpressionWrapper(
+        Least(F("check_out"), Value(today))
+        - Greatest(F("check_in"), Value(window_start)),
+        output_field=DurationField(),
+    )
+    recent = Q(created_at__gte=created_since)
+    bookings = Booking.objects.aggregate(
+        bookings_today=Count("pk", filter=Q(check_in=today)),
+        bookings_month=Count("pk", filter=recent),
+        month_revenue=Sum("total_price", filter=recent & Q(status="confirmed")),
+        booked_nights=Sum(
+            nights_in_window,
+            filter=Q(
+                status__in=OCCUPYING_STATUSES,
+                check_in__lt=today,
+                check_out__gt=window_start,
+            ),
+        ),
+    )
+
+    booked_nights = bookings.pop("booked_nights")
+    booked_nights = booked_nights.days if booked_nights else 0
+    available_nights = rooms["available_rooms"] * WINDOW_DAYS
+    return {
+        **rooms,
+        **bookings,
+        "month_revenue": bookings["month_revenue"] or 0,
+        "booked_nights": booked_nights,
+        "occupancy_rate": (
+            booked_nights / available_nights * 100 if available_nights else 0
+        ),
+        "computed_at": timezone.now(),
+    }
+
+
+def snapshot_from_replica():
+    with replica_reads():
+        return compute_snapshot()
+
+
+def refresh_snapshot():
+    return refresh_cached(
+        SNAPSHOT_KEY, snapshot_from_replica, settings.DASHBOARD_SNAPSHOT_TTL
+    )
+
+
+def get_snapshot():
+    """Dashboard tiles, served stale while one worker refreshes them"""
+    return stale_while_revalidate(
+        SNAPSHOT_KEY, snapshot_from_replica, settings.DASHBOARD_SNAPSHOT_TTL
+    )
+
+
+def recent_bookings():
+    """The latest bookings for the dashboard, cached like the tiles"""
+    return stale_while_revalidate(
+        RECENT_BOOKINGS_KEY,
+        lambda: list(
+            Booking.objects.select_related("user", "room").order_by("-created_at")[
+                :RECENT_BOOKINGS
+            ]
+        ),
+        settings.DASHBOARD_SNAPSHOT_TTL,
+    )
@@ -0,0 +1,112 @@
+# core/db_router.py
+import random
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_PIN_COOKIE = "db_pin"
+
+
+class RoutingState:
+    """Per-request routing flags shared by the router and ``replica_reads``"""
+
+    def __init__(self, pinned=False):
+        self.replica_depth = 0
+        # Set by the first write; later reads must see it, so stay on primary
+        self.pinned = pinned
+        self.wrote = False
+
+
+_routing = ContextVar("db_routing", default=None)
+
+
+def routing_state():
+    state = _routing.get()
+    if state is None:
+        state = RoutingState()
+        _routing.set(state)
+    return state
+
+
+def begin_request(pinned=False):
+    """Start fresh routing state for a request; pass the token to ``end_request``"""
+    return _routing.set(RoutingState(pinned=pinned))
+
+
+def end_request(token):
+    _routing.reset(token)
+
+
+class replica_reads(ContextDecorator):
+    """Let reads inside the block go to a replica.
+
+    Reads everywhere else use the primary, so availability checks and
+    booking validation never see replication lag. A write anywhere in the
+    request pins its remaining reads to the primary.
+    """
+
+    def __enter__(self):
+        routing_state().replica_depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        routing_state().replica_depth -= 1
+        return False
+
+
+def read_from_replica(view_func=None, *, anonymous_only=False):
+    """Run a view, including its template rendering, inside ``replica_reads``.
+
+    With ``anonymous_only`` signed-in users keep reading from the primary, so
+    they always see their own bookings and profile changes.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if anonymous_only and request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+            with replica_reads():
+                response = view_func(request, *args, **kwargs)
+                # Template responses query lazily while rendering
+                if hasattr(response, "render") and not response.is_rendered:
+                    response.render()
+            return response
+
+        return wrapped
+
+    return decorator(view_func) if view_func else decorator
+
+
+class PrimaryReplicaRouter:
+    """Route ``replica_reads`` blocks to a random ``DATABASE_REPLICAS`` alias.
+
+    Writes, reads outside those blocks and reads after the request has
+    written (including ``select_for_update``, routed as a write) all go to
+    ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or state is None or not state.replica_depth or state.pinned:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = routing_state()
+        state.pinned = state.wrote = True
+        # Instances read from a replica must still be saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -0,0 +1,112 @@
+# core/files.py
+import mimetypes
+import stat
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+COMPRESSED_CONTENT_TYPES = {
+    "br": "application/x-brotli",
+    "bzip2": "application/x-bzip",
+    "compress": "application/x-compress",
+    "gzip": "application/gzip",
+    "xz": "application/x-xz",
+}
+
+
+def resolve_file(root, path):
+    """Resolve ``path`` under ``root`` and return it with its stat result.
+
+    Raises Http404 for traversal attempts, missing files and directories.
+    """
+    try:
+        fullpath = Path(safe_join(root, path))
+    except (SuspiciousFileOperation, ValueError):
+        raise Http404("File not found")
+
+    try:
+        file_stat = fullpath.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("File not found")
+
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404("File not found")
+
+    return fullpath, file_stat
+
+
+def file_etag(file_stat):
+    """Strong ETag built from the file's mtime and size"""
+    return quote_etag(f"{int(file_stat.st_mtime_ns):x}-{file_stat.st_size:x}")
+
+
+def conditional_file_response(request, file_stat, etag=None):
+    """Return a 304/412 response if the client's validators still match"""
+    return get_conditional_response(
+        request,
+        etag=etag or file_etag(file_stat),
+        last_modified=int(file_stat.st_mtime),
+    )
+
+
+def set_file_headers(response, file_stat, etag=None, max_age=None):
+    response["ETag"] = etag or file_etag(file_stat)
+    response["Last-Modified"] = http_date(file_stat.st_mtime)
+    if max_age is not None:
+        response["Cache-Control"] = f"public, max-age={max_age}"
+    return response
+
+
+def is_media_authorized(request, path):
+    """Public upload directories are open to everyone, anything else is staff-only"""
+    top_level = path.split("/", 1)[0]
+    if top_level in settings.MEDIA_PUBLIC_DIRECTORIES:
+        return True
+    return request.user.is_authenticated and request.user.is_staff
+
+
+def serve_media(request, path):
+    """Authorize and resolve a media file, then hand the transfer off.
+
+    With ``MEDIA_SERVE_MODE = "x-accel"`` or ``"x-sendfile"`` Django only sends
+    headers and the front server streams the bytes. The ``"django"`` mode falls
+    back to ``FileResponse``, which uses the server's ``wsgi.file_wrapper``
+    (sendfile) when one is available.
+    """
+    if not is_media_authorized(request, path):
+        raise Http404("File not found")
+
+    fullpath, file_stat = resolve_file(settings.MEDIA_ROOT, path)
+    etag = file_etag(file_stat)
+
+    not_modified = conditional_file_response(request, file_stat, etag)
+    if not_modified is not None:
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(str(fullpath))
+    # Like FileResponse, describe compressed uploads by their compression and
+    # never send Content-Encoding, which would make browsers unpack them
+    content_type = COMPRESSED_CONTENT_TYPES.get(encoding, content_type)
+    content_type = content_type or "application/octet-stream"
+    mode = settings.MEDIA_SERVE_MODE
+
+    if mode == "x-accel":
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(
+            path
+        )
+    elif mode == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = str(fullpath)
+    else:
+        response = FileResponse(fullpath.open("rb"), content_type=content_type)
+
+    return set_file_headers(
+        response, file_stat, etag=etag, max_age=settings.MEDIA_CACHE_MAX_AGE
+    )
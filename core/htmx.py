@@ -0,0 +1,11 @@
+# core/htmx.py
+
+
+def is_htmx_partial(request):
+    """Whether an HTMX request should get a partial instead of the full page.
+
+    Boosted links and history restoration swap in the whole document, so they
+    get the full page like any other request.
+    """
+    htmx = getattr(request, "htmx", None)
+    return bool(htmx) and not htmx.boosted and not htmx.history_restore_request
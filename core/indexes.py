@@ -0,0 +1,120 @@
+# core/indexes.py
+from django.db.migrations.operations.base import Operation
+from django.utils.deconstruct import deconstructible
+
+POSTGRES = ("postgresql",)
+ALL_VENDORS = ("postgresql", "sqlite")
+
+
+@deconstructible
+class RawIndex:
+    """An index Django's ``Meta.indexes`` cannot express on every database.
+
+    ``expression`` is the SQL between the parentheses of ``CREATE INDEX``;
+    the index is only built on the listed ``vendors``. ``where`` makes it a
+    partial index on PostgreSQL only: Django binds filter values as
+    parameters, and SQLite cannot match a partial index against those, so it
+    gets the full index instead.
+    """
+
+    def __init__(
+        self, name, table, expression, using=None, where=None, vendors=ALL_VENDORS
+    ):
+        self.name = name
+        self.table = table
+        self.expression = expression
+        self.using = using
+        self.where = where
+        self.vendors = vendors
+
+    def create_sql(self, connection):
+        quote = connection.ops.quote_name
+        # Build large indexes without blocking writes where the database can
+        concurrently = " CONCURRENTLY" if connection.vendor == "postgresql" else ""
+        using = f" USING {self.using}" if self.using else ""
+        where = (
+            f" WHERE {self.where}"
+            if self.where and connection.vendor == "postgresql"
+            else ""
+        )
+        return (
+            f"CREATE INDEX{concurrently} IF NOT EXISTS {quote(self.name)} "
+            f"ON {quote(self.table)}{using} ({self.expression}){where}"
+        )
+
+    def drop_sql(self, connection):
+        concurrently = " CONCURRENTLY" if connection.vendor == "postgresql" else ""
+        return (
+            f"DROP INDEX{concurrently} IF EXISTS "
+            f"{connection.ops.quote_name(self.name)}"
+        )
+
+
+def trigram_index(name, table, column):
+    """GIN trigram index matching the ``UPPER(col::text)`` that PostgreSQL's
+    ``icontains``/``istartswith`` lookups compare against"""
+    return RawIndex(
+        name,
+        table,
+        f'UPPER("{column}"::text) gin_trgm_ops',
+        using="gin",
+        vendors=POSTGRES,
+    )
+
+
+def lower_index(name, table, column):
+    """B-tree index on ``lower(col)`` for case-insensitive equality lookups"""
+    return RawIndex(name, table, f'lower("{column}")')
+
+
+def lower_prefix_index(name, table, column):
+    """``lower(col)`` index for case-insensitive ``startswith`` lookups.
+
+    A plain ``lower_index`` only serves ``LIKE 'term%'`` under the C collation;
+    ``text_pattern_ops`` makes PostgreSQL use it whatever the locale.
+    """
+    return RawIndex(
+        name, table, f'lower("{column}") text_pattern_ops', vendors=POSTGRES
+    )
+
+
+class CreateRawIndexes(Operation):
+    """Migration operation creating ``RawIndex`` objects on matching vendors.
+
+    Indexes are not part of the model state, so ``makemigrations`` never
+    sees them, and SQLite drops them when a later migration rebuilds the
+    table. Migrations using it should set ``atomic = False`` so that
+    PostgreSQL can build the indexes ``CONCURRENTLY``; ``pg_trgm`` is enabled
+    first when a trigram index is involved.
+    """
+
+    reduces_to_sql = False
+    reversible = True
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def applicable(self, connection):
+        return [index for index in self.indexes if connection.vendor in index.vendors]
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        connection = schema_editor.connection
+        indexes = self.applicable(connection)
+        if any("gin_trgm_ops" in index.expression for index in indexes):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for index in indexes:
+            schema_editor.execute(index.create_sql(connection))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        connection = schema_editor.connection
+        for index in reversed(self.applicable(connection)):
+            schema_editor.execute(index.drop_sql(connection))
+
+    def describe(self):
+        return "Create indexes " + ", ".join(index.name for index in self.indexes)
+
+    def deconstruct(self):
+        return self.__class__.__name__, [self.indexes], {}
@@ -0,0 +1,153 @@
+# core/instrumentation.py
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+_string_literal_re = re.compile(r"'(?:[^']|'')*'")
+_number_re = re.compile(r"\b\d+(?:\.\d+)?\b")
+_placeholder_list_re = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_whitespace_re = re.compile(r"\s+")
+
+_current_timing = ContextVar("server_timing", default=None)
+
+
+class NPlusOneError(Exception):
+    """Raised when a request repeats the same query shape too many times"""
+
+
+def fingerprint(sql):
+    """Reduce a statement to its shape so per-row repeats collapse together"""
+    sql = _string_literal_re.sub("?", sql)
+    sql = _number_re.sub("?", sql)
+    sql = _placeholder_list_re.sub("(...)", sql)
+    return _whitespace_re.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` that counts, times and fingerprints queries.
+
+    With ``count_only`` only ``count`` and ``duration`` are kept, skipping the
+    fingerprint regexes on always-on paths.
+    """
+
+    def __init__(self, capture_sql=False, count_only=False):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.capture_sql = capture_sql
+        self.count_only = count_only
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if self.count_only:
+                return
+            self.fingerprints[fingerprint(sql)] += 1
+            if self.capture_sql:
+                self.queries.append(
+                    {
+                        "alias": context["connection"].alias,
+                        "sql": sql,
+                        "params": repr(params),
+                        "time": elapsed,
+                    }
+                )
+
+    @contextmanager
+    def record(self):
+        with ExitStack() as stack:
+            for connection in connections.all(initialized_only=False):
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    def repeated(self, threshold):
+        """Fingerprints executed at least ``threshold`` times, most frequent first"""
+        return [
+            (sql, count)
+            for sql, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+    def summary(self, threshold):
+        repeated = self.repeated(threshold)
+        return {
+            "queries": self.count,
+            "db_time_ms": round(self.duration * 1000, 2),
+            "n_plus_one": bool(repeated),
+            "repeated": [
+                {"fingerprint": sql[:300], "count": count} for sql, count in repeated
+            ],
+        }
+
+
+@contextmanager
+def detect_n_plus_one(threshold):
+    """Fail the block if any query shape runs ``threshold`` times or more"""
+    with QueryRecorder().record() as recorder:
+        yield recorder
+    repeated = recorder.repeated(threshold)
+    if repeated:
+        sql, count = repeated[0]
+        raise NPlusOneError(f"Query repeated {count} times: {sql[:300]}")
+
+
+class ServerTiming:
+    """Named durations collected during one request for the Server-Timing header"""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, seconds, description=None):
+        duration, previous = self.metrics.get(name, (0.0, None))
+        self.metrics[name] = (duration + seconds, description or previous)
+
+    def header(self):
+        entries = []
+        for name, (seconds, description) in self.metrics.items():
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if description:
+                entry += f';desc="{description}"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+
+@contextmanager
+def collect_server_timing():
+    timing = ServerTiming()
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
+
+
+def current_server_timing():
+    return _current_timing.get()
+
+
+@contextmanager
+def timer(name, description=None):
+    """Add the block's wall time to the current request's Server-Timing.
+
+    Outside a request collected by ServerTimingMiddleware this does nothing, so
+    it can stay around hot paths permanently. Works as a decorator too.
+    """
+    timing = _current_timing.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started, description)
@@ -0,0 +1,372 @@
+# core/loadtest.py
+import io
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from importlib import import_module
+from pathlib import Path
+from urllib.parse import urlencode, urlparse
+
+import requests
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from bookings.models import Booking
+
+ENDPOINTS = ("book_room", "booking_create")
+ACTIVE_STATUSES = ("pending", "confirmed")
+
+# Database connection handling compared by run_availability_benchmark
+CONNECTION_PROFILES = {
+    "per-request": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "persistent": {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True},
+    # PostgreSQL only; pool sizes are filled in from the concurrency
+    "pool": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+}
+
+
+@contextmanager
+def throwaway_database():
+    """Create a fresh test database that server threads can share, drop it on exit"""
+    old_name = connection.settings_dict["NAME"]
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == "sqlite":
+            # Threads need their own connections to one shared file
+            connection.settings_dict["TEST"]["NAME"] = str(
+                Path(directory) / "load_test.sqlite3"
+            )
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def create_load_users(count, prefix="load"):
+    """Guests for the simulated traffic, created in bulk if missing"""
+    User.objects.bulk_create(
+        [User(username=f"{prefix}-{n:05d}") for n in range(count)],
+        ignore_conflicts=True,
+    )
+    return list(
+        User.objects.filter(username__startswith=f"{prefix}-").order_by("pk")[:count]
+    )
+
+
+def login_session(user):
+    """Create a logged-in session the way ``Client.force_login`` does"""
+    engine = import_module(settings.SESSION_ENGINE)
+    session = engine.SessionStore()
+    session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    return session.session_key
+
+
+def http_session(base_url, user):
+    """A ``requests`` session carrying the user's session and a CSRF token"""
+    http = requests.Session()
+    csrf_token = get_random_string(32)
+    http.cookies.set(settings.SESSION_COOKIE_NAME, login_session(user))
+    http.cookies.set(settings.CSRF_COOKIE_NAME, csrf_token)
+    http.headers["X-CSRFToken"] = csrf_token
+    http.headers["Referer"] = base_url
+    return http
+
+
+def room_weights(count, skew):
+    """Zipf-like popularity: room ``i`` is picked in proportion to 1 / (i + 1)^skew"""
+    return [1 / (rank + 1) ** skew for rank in range(count)]
+
+
+def book(http, base_url, endpoint, room_id, check_in, check_out):
+    """POST one booking and classify it as created, conflict or error"""
+    if endpoint == "book_room":
+        path = reverse("rooms:book_room", kwargs={"pk": room_id})
+    else:
+        path = reverse("bookings:booking_create", kwargs={"room_pk": room_id})
+    data = {
+        "check_in": check_in.isoformat(),
+        "check_out": check_out.isoformat(),
+        "adults": 1,
+        "children": 0,
+    }
+    response = http.post(base_url + path, data=data, allow_redirects=False)
+
+    location = urlparse(response.headers.get("Location", "")).path
+    if response.status_code == 302 and location.startswith("/bookings/"):
+        return "created"
+    # book_room sends conflicts back to the room page, the form re-renders
+    if response.status_code == 302 and location.startswith("/rooms/"):
+        return "conflict"
+    if response.status_code == 200 and "not available" in response.text:
+        return "conflict"
+    return "error"
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[
+        min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    ]
+
+
+def run_load_test(
+    base_url,
+    room_ids,
+    users=100,
+    requests_per_user=5,
+    concurrency=None,
+    skew=1.0,
+    window=30,
+    endpoints=ENDPOINTS,
+    seed=None,
+):
+    """Drive the booking endpoints with concurrent simulated guests.
+
+    Every guest gets its own HTTP session and books ``requests_per_user``
+    random stays of 1-4 nights within the next ``window`` days, picking rooms
+    with the given popularity skew. Returns throughput, latency percentiles
+    and outcome counts overall and per endpoint.
+    """
+    base_url = base_url.rstrip("/")
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    weights = room_weights(len(room_ids), skew)
+    guests = create_load_users(users)
+
+    plans = []
+    for guest in guests:
+        stays = []
+        for _ in range(requests_per_user):
+            check_in = today + timedelta(days=rng.randint(1, window))
+            stays.append(
+                (
+                    rng.choice(endpoints),
+                    rng.choices(room_ids, weights)[0],
+                    check_in,
+                    check_in + timedelta(days=rng.randint(1, 4)),
+                )
+            )
+        plans.append((http_session(base_url, guest), stays))
+
+    lock = threading.Lock()
+    samples = []
+
+    def simulate(plan):
+        http, stays = plan
+        for endpoint, room_id, check_in, check_out in stays:
+            started = time.perf_counter()
+            try:
+                outcome = book(http, base_url, endpoint, room_id, check_in, check_out)
+            except requests.RequestException:
+                outcome = "error"
+            elapsed = time.perf_counter() - started
+            with lock:
+                samples.append((endpoint, outcome, elapsed))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency or users) as pool:
+        list(pool.map(simulate, plans))
+    duration = time.perf_counter() - started
+
+    return summarize(samples, duration)
+
+
+def latency_summary(elapsed):
+    latencies = sorted(elapsed)
+    return {
+        name: round(percentile(latencies, fraction) * 1000, 1)
+        for name, fraction in (
+            ("p50", 0.5),
+            ("p90", 0.9),
+            ("p95", 0.95),
+            ("p99", 0.99),
+            ("max", 1.0),
+        )
+    }
+
+
+def summarize(samples, duration):
+    def stats(rows):
+        outcomes = Counter(outcome for _, outcome, _ in rows)
+        return {
+            "requests": len(rows),
+            "created": outcomes["created"],
+            "conflicts": outcomes["conflict"],
+            "errors": outcomes["error"],
+            "throughput_rps": round(len(rows) / duration, 1) if duration else 0.0,
+            "bookings_per_second": (
+                round(outcomes["created"] / duration, 1) if duration else 0.0
+            ),
+            "latency_ms": latency_summary(elapsed for _, _, elapsed in rows),
+        }
+
+    report = stats(samples)
+    report["duration_s"] = round(duration, 2)
+    report["endpoints"] = {
+        endpoint: stats([row for row in samples if row[0] == endpoint])
+        for endpoint in sorted({row[0] for row in samples})
+    }
+    return report
+
+
+def find_overlaps(room_ids=None):
+    """Pairs of active bookings on the same room whose stays intersect"""
+    bookings = Booking.objects.filter(status__in=ACTIVE_STATUSES)
+    if room_ids is not None:
+        bookings = bookings.filter(room_id__in=room_ids)
+    rows = bookings.order_by("room_id", "check_in").values_list(
+        "pk", "room_id", "check_in", "check_out"
+    )
+
+    overlaps = []
+    latest = {}
+    for pk, room_id, check_in, check_out in rows.iterator():
+        previous = latest.get(room_id)
+        if previous and check_in < previous[1]:
+            overlaps.append((previous[0], pk))
+        if not previous or check_out > previous[1]:
+            latest[room_id] = (pk, check_out)
+    return overlaps
+
+
+@contextmanager
+def connection_profile(name, pool_size, alias=DEFAULT_DB_ALIAS):
+    """Temporarily switch ``alias`` to one of ``CONNECTION_PROFILES``.
+
+    Django builds every thread's connection from the same settings dict, so
+    updating it in place reaches the worker threads started afterwards.
+    """
+    settings_dict = connections[alias].settings_dict
+    overrides = dict(CONNECTION_PROFILES[name])
+    if name == "pool":
+        if connections[alias].vendor != "postgresql":
+            raise ValueError("Connection pooling needs PostgreSQL with psycopg 3")
+        overrides["OPTIONS"] = {
+            **settings_dict["OPTIONS"],
+            "pool": {"min_size": pool_size, "max_size": pool_size},
+        }
+    saved = {key: settings_dict[key] for key in overrides}
+
+    connections.close_all()
+    settings_dict.update(overrides)
+    try:
+        yield
+    finally:
+        if name == "pool":
+            connections[alias].close_pool()
+        connections.close_all()
+        settings_dict.update(saved)
+
+
+def wsgi_get(handler, path, params):
+    """Run one GET through the full WSGI stack, as a threaded server would.
+
+    Unlike the test client this fires ``request_started``/``request_finished``
+    with ``close_old_connections`` connected, so connection reuse behaves as
+    in production.
+    """
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": urlencode(params),
+        "SCRIPT_NAME": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": "localhost",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+    }
+    statuses = []
+    response = handler(environ, lambda status, headers: statuses.append(status))
+    try:
+        b"".join(response)
+    finally:
+        response.close()
+    return statuses[0]
+
+
+def run_availability_benchmark(
+    room_ids,
+    profiles=("per-request", "persistent"),
+    requests=2000,
+    concurrency=20,
+    window=30,
+    seed=None,
+):
+    """Latency of ``bookings:check_availability`` under each connection profile.
+
+    ``concurrency`` worker threads, like a threaded WSGI worker, share the
+    requests; every request picks a random room and stay. Returns
+    throughput and latency percentiles per profile.
+    """
+    handler = WSGIHandler()
+    today = timezone.localdate()
+    rng = random.Random(seed)
+    plan = []
+    for _ in range(requests):
+        check_in = today + timedelta(days=rng.randint(1, window))
+        plan.append(
+            (
+                reverse(
+                    "bookings:check_availability",
+                    kwargs={"room_pk": rng.choice(room_ids)},
+                ),
+                {
+                    "check_in": check_in.isoformat(),
+                    "check_out": (
+                        check_in + timedelta(days=rng.randint(1, 4))
+                    ).isoformat(),
+                },
+            )
+        )
+
+    report = {}
+    for name in profiles:
+        lock = threading.Lock()
+        samples = []
+
+        def worker(share):
+            try:
+                for path, params in share:
+                    started = time.perf_counter()
+                    status = wsgi_get(handler, path, params)
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        samples.append((status.startswith("200"), elapsed))
+            finally:
+                connections.close_all()
+
+        with connection_profile(name, pool_size=concurrency):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(
+                    pool.map(worker, [plan[n::concurrency] for n in range(concurrency)])
+                )
+            duration = time.perf_counter() - started
+
+        report[name] = {
+            "requests": len(samples),
+            "errors": sum(not ok for ok, _ in samples),
+            "throughput_rps": round(len(samples) / duration, 1) if duration else 0.0,
+            "latency_ms": latency_summary(elapsed for _, elapsed in samples),
+        }
+    return report
@@ -0,0 +1,122 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from bookings.models import Booking
+from core.benchmarks import (
+    SCENARIOS,
+    compare,
+    read_results,
+    run_benchmarks,
+    write_results,
+)
+from core.seeding import seed_hotel
+from rooms.models import Room
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database and time the catalog, booking and analytics "
+        "hot paths, comparing against a stored baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=200)
+        parser.add_argument("--bookings", type=int, default=20000)
+        parser.add_argument("--years", type=int, default=2)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=sorted(SCENARIOS),
+            help="Only run this scenario (repeatable)",
+        )
+        parser.add_argument(
+            "--output", default=str(settings.BASE_DIR / "benchmarks" / "latest.json")
+        )
+        parser.add_argument(
+            "--baseline",
+            default=str(settings.BASE_DIR / "benchmarks" / "baseline.json"),
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Store this run as the new baseline instead of comparing",
+        )
+        parser.add_argument("--time-tolerance", type=float, default=0.25)
+        parser.add_argument("--memory-tolerance", type=float, default=0.25)
+        parser.add_argument(
+            "--current-db",
+            action="store_true",
+            help=(
+                "Run in the configured database instead of a throwaway test "
+                "database, seeding it only if it has no rooms yet"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["current_db"]:
+            results = self.run(options)
+        else:
+            old_name = connection.settings_dict["NAME"]
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            try:
+                results = self.run(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        output = Path(options["output"])
+        write_results(results, output)
+        for name, result in results["scenarios"].items():
+            self.stdout.write(
+                f"{name:<22} median {result['median_ms']:9.2f} ms   "
+                f"p95 {result['p95_ms']:9.2f} ms   "
+                f"{result['queries']:4d} queries   peak {result['peak_kb']:9.1f} KiB"
+            )
+        self.stdout.write(f"Results written to {output}")
+
+        baseline = Path(options["baseline"])
+        if options["save_baseline"]:
+            write_results(results, baseline)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline}"))
+            return
+        if not baseline.exists():
+            self.stdout.write(f"No baseline at {baseline}; run with --save-baseline")
+            return
+
+        regressions = compare(
+            results,
+            read_results(baseline),
+            time_tolerance=options["time_tolerance"],
+            memory_tolerance=options["memory_tolerance"],
+        )
+        if regressions:
+            raise CommandError("Regressions:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
+
+    def run(self, options):
+        if not Room.objects.exists():
+            counts = seed_hotel(
+                rooms=options["rooms"],
+                bookings=options["bookings"],
+                years=options["years"],
+                seed=options["seed"],
+            )
+            self.stdout.write(
+                f"Seeded {counts['rooms']} rooms and {counts['bookings']} bookings"
+            )
+        return run_benchmarks(
+            options["scenario"],
+            iterations=options["iterations"],
+            metadata={
+                "rooms": Room.objects.count(),
+                "bookings": Booking.objects.count(),
+                "years": options["years"],
+                "seed": options["seed"],
+            },
+        )
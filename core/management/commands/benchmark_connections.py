@@ -0,0 +1,99 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+
+from core.loadtest import (
+    CONNECTION_PROFILES,
+    run_availability_benchmark,
+    throwaway_database,
+)
+from core.seeding import seed_hotel
+from rooms.models import Room
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare check_availability latency under concurrency with per-request "
+        "database connections, persistent connections and a connection pool"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument(
+            "--concurrency", type=int, default=20, help="Worker threads"
+        )
+        parser.add_argument("--rooms", type=int, default=20)
+        parser.add_argument(
+            "--profile",
+            action="append",
+            choices=CONNECTION_PROFILES,
+            dest="profiles",
+            help="Defaults to all profiles the database supports",
+        )
+        parser.add_argument(
+            "--current-db",
+            action="store_true",
+            help="Use the configured database instead of a throwaway one",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Write the JSON report here")
+
+    def handle(self, *args, **options):
+        profiles = options["profiles"] or [
+            name
+            for name in CONNECTION_PROFILES
+            if name != "pool" or connection.vendor == "postgresql"
+        ]
+        if "pool" in profiles and connection.vendor != "postgresql":
+            raise CommandError("The pool profile needs PostgreSQL with psycopg 3")
+
+        if options["current_db"]:
+            report = self.run(profiles, options)
+        else:
+            with throwaway_database():
+                seed_hotel(
+                    rooms=options["rooms"],
+                    bookings=options["rooms"] * 50,
+                    years=1,
+                    seed=options["seed"],
+                    notifications=False,
+                )
+                report = self.run(profiles, options)
+
+        baseline = report[profiles[0]]["latency_ms"]["p50"]
+        for name, stats in report.items():
+            latency = stats["latency_ms"]
+            self.stdout.write(
+                f"{name:<12} {stats['throughput_rps']:8.1f} req/s  "
+                f"p50 {latency['p50']:7.2f} ms  p95 {latency['p95']:7.2f} ms  "
+                f"p99 {latency['p99']:7.2f} ms  errors {stats['errors']:4d}  "
+                f"p50 x{baseline / latency['p50'] if latency['p50'] else 0:.2f}"
+            )
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+
+    def run(self, profiles, options):
+        room_ids = list(
+            Room.objects.filter(is_active=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)[: options["rooms"]]
+        )
+        if not room_ids:
+            raise CommandError("No active rooms to check; run seed_hotel first")
+
+        # Coalesced checks would share results instead of using a connection
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "localhost"],
+            SINGLE_FLIGHT_ENABLED=False,
+        ):
+            return run_availability_benchmark(
+                room_ids,
+                profiles=profiles,
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+                seed=options["seed"],
+            )
@@ -0,0 +1,57 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.cache import invalidate_tags, page_cache_stats
+from rooms.models import Room
+
+
+class Command(BaseCommand):
+    help = "Measure requests per second of anonymous catalog pages, cold and warm"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+
+    def handle(self, *args, **options):
+        urls = [reverse("core:home"), reverse("rooms:room_list")]
+        room = Room.objects.filter(is_active=True).first()
+        if room:
+            urls.append(reverse("rooms:room_detail", kwargs={"pk": room.pk}))
+
+        client = Client()
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            PAGE_CACHE_ENABLED=True,
+        ):
+            for url in urls:
+                cold = self.measure(client, url, options["requests"], cold=True)
+                warm = self.measure(client, url, options["requests"], cold=False)
+                self.stdout.write(
+                    f"{url:<40} cold {cold:8.1f} req/s   warm {warm:8.1f} req/s"
+                    f"   x{warm / cold if cold else 0:.1f}"
+                )
+
+        stats = page_cache_stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} "
+            f"hit_ratio={stats['hit_ratio']:.2%}"
+        )
+
+    def measure(self, client, url, requests, cold):
+        client.get(url)
+        started = time.perf_counter()
+        for _ in range(requests):
+            if cold:
+                invalidate_tags("home", "room_list", *self.room_tags())
+            client.get(url)
+        return requests / (time.perf_counter() - started)
+
+    def room_tags(self):
+        if not hasattr(self, "_room_tags"):
+            self._room_tags = [
+                f"room:{pk}" for pk in Room.objects.values_list("pk", flat=True)
+            ]
+        return self._room_tags
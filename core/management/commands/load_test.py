@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.handlers import StaticFilesHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.test.testcases import LiveServerThread
+
+from core.loadtest import ENDPOINTS, find_overlaps, run_load_test, throwaway_database
+from core.seeding import seed_hotel
+from rooms.models import Room
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the booking endpoints with concurrent guests and check that no "
+        "two active bookings overlap afterwards"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            help=(
+                "Target a running server that shares this database; by default a "
+                "live test server is started on a throwaway database"
+            ),
+        )
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=5, help="Per user")
+        parser.add_argument(
+            "--concurrency", type=int, help="Worker threads, defaults to --users"
+        )
+        parser.add_argument("--rooms", type=int, default=20, help="Rooms targeted")
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.0,
+            help="Zipf exponent for room popularity, 0 spreads load evenly",
+        )
+        parser.add_argument("--window", type=int, default=30, help="Days ahead")
+        parser.add_argument(
+            "--endpoint", action="append", choices=ENDPOINTS, dest="endpoints"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Write the JSON report here")
+
+    def handle(self, *args, **options):
+        if options["base_url"]:
+            report = self.run(options["base_url"], options)
+        else:
+            report = self.run_on_live_server(options)
+
+        self.stdout.write(
+            f"{report['requests']} requests in {report['duration_s']}s: "
+            f"{report['throughput_rps']} req/s, "
+            f"{report['bookings_per_second']} bookings/s"
+        )
+        for endpoint, stats in report["endpoints"].items():
+            latency = stats["latency_ms"]
+            self.stdout.write(
+                f"{endpoint:<15} created {stats['created']:5d}  "
+                f"conflicts {stats['conflicts']:5d}  errors {stats['errors']:5d}  "
+                f"p50 {latency['p50']:7.1f} ms  p95 {latency['p95']:7.1f} ms  "
+                f"p99 {latency['p99']:7.1f} ms"
+            )
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+
+        if report["overlaps"]:
+            raise CommandError(
+                f"{len(report['overlaps'])} overlapping active bookings, "
+                f"e.g. {report['overlaps'][:5]}"
+            )
+        self.stdout.write(self.style.SUCCESS("No overlapping active bookings"))
+
+    def run(self, base_url, options):
+        room_ids = list(
+            Room.objects.filter(is_active=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)[: options["rooms"]]
+        )
+        if not room_ids:
+            raise CommandError("No active rooms to book; run seed_hotel first")
+
+        report = run_load_test(
+            base_url,
+            room_ids,
+            users=options["users"],
+            requests_per_user=options["requests"],
+            concurrency=options["concurrency"],
+            skew=options["skew"],
+            window=options["window"],
+            endpoints=options["endpoints"] or ENDPOINTS,
+            seed=options["seed"],
+        )
+        report["overlaps"] = find_overlaps(room_ids)
+        return report
+
+    def run_on_live_server(self, options):
+        with throwaway_database():
+            seed_hotel(
+                rooms=options["rooms"],
+                bookings=options["rooms"] * 50,
+                years=1,
+                seed=options["seed"],
+                notifications=False,
+            )
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "localhost"]
+            ):
+                server = LiveServerThread("localhost", StaticFilesHandler)
+                server.daemon = True
+                server.start()
+                server.is_ready.wait()
+                if server.error:
+                    raise server.error
+                try:
+                    return self.run(f"http://localhost:{server.port}", options)
+                finally:
+                    server.terminate()
@@ -0,0 +1,304 @@
+# core/metrics.py
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import suppress
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+logger = logging.getLogger("core.metrics")
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry or REGISTRY
+        self._values = {}
+        self._lock = threading.Lock()
+        self.registry.register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                json.dumps(key): self._copy(value)
+                for key, value in self._values.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        self.registry.changed()
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    @staticmethod
+    def merge(left, right):
+        return left + right
+
+    def expose(self, values):
+        for key, value in sorted(values.items()):
+            labels = _format_labels(self.labelnames, json.loads(key))
+            yield f"{self.name}{labels} {_format_number(value)}"
+
+
+class Histogram(Metric):
+    """Fixed-bucket histogram; each entry is ``[bucket counts..., sum, count]``"""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, **kwargs
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, **kwargs)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            entry[index] += 1
+            entry[-2] += value
+            entry[-1] += 1
+        self.registry.changed()
+
+    @staticmethod
+    def _copy(value):
+        return list(value)
+
+    @staticmethod
+    def merge(left, right):
+        return [a + b for a, b in zip(left, right)]
+
+    def expose(self, values):
+        bounds = [*self.buckets, float("inf")]
+        for key, entry in sorted(values.items()):
+            label_values = json.loads(key)
+            cumulative = 0
+            for bound, count in zip(bounds, entry):
+                cumulative += count
+                labels = _format_labels(
+                    self.labelnames, label_values, [("le", _format_number(bound))]
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, label_values)
+            yield f"{self.name}_sum{labels} {_format_number(entry[-2])}"
+            yield f"{self.name}_count{labels} {entry[-1]}"
+
+
+def _process_exists(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Alive, but owned by another user
+        return True
+    return True
+
+
+class Registry:
+    """In-process metrics, optionally shared between workers through files.
+
+    With ``METRICS_DIR`` set every worker periodically writes its own snapshot
+    to ``metrics-<pid>.json`` in that directory and the exposition sums all of
+    them, so any worker can answer a scrape for the whole deployment. Snapshots
+    of workers that have exited are deleted, so the directory must not be
+    shared between hosts.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+
+    def reset(self):
+        for metric in self.metrics.values():
+            metric.reset()
+
+    def snapshot(self):
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    @property
+    def directory(self):
+        return Path(settings.METRICS_DIR) if settings.METRICS_DIR else None
+
+    def snapshot_path(self, pid=None):
+        return self.directory / f"metrics-{pid or os.getpid()}.json"
+
+    def _flush_due(self):
+        return time.monotonic() - self._last_flush >= settings.METRICS_FLUSH_INTERVAL
+
+    def changed(self):
+        if not self.directory or not self._flush_due():
+            return
+        # Threads finding another one mid-flush skip it instead of queueing up
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            if self._flush_due():
+                self._write_snapshot()
+        finally:
+            self._flush_lock.release()
+
+    def flush(self):
+        if not self.directory:
+            return
+        with self._flush_lock:
+            self._write_snapshot()
+
+    def _write_snapshot(self):
+        """Replace this worker's snapshot; failures are logged, never raised"""
+        self._last_flush = time.monotonic()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.snapshot_path()
+            descriptor, temporary = tempfile.mkstemp(
+                dir=self.directory, prefix=f"{path.stem}-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(descriptor, "w") as file:
+                    json.dump(self.snapshot(), file)
+                os.replace(temporary, path)
+            except BaseException:
+                Path(temporary).unlink(missing_ok=True)
+                raise
+        except OSError:
+            logger.exception("Could not write metrics snapshot to %s", self.directory)
+
+    def collect(self):
+        """Merge this worker's live values with every other worker's snapshot"""
+        merged = self.snapshot()
+        if not self.directory or not self.directory.exists():
+            return merged
+
+        own_path = self.snapshot_path()
+        for path in self.directory.glob("metrics-*.json"):
+            if path == own_path:
+                continue
+            pid = path.stem.removeprefix("metrics-")
+            if pid.isdigit() and not _process_exists(int(pid)):
+                # Left by a worker that has exited, whose totals went with it
+                with suppress(OSError):
+                    path.unlink()
+                continue
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, values in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                target = merged[name]
+                for key, value in values.items():
+                    target[key] = (
+                        metric.merge(target[key], value) if key in target else value
+                    )
+        return merged
+
+    def expose(self):
+        """Render every metric in the Prometheus text exposition format"""
+        collected = self.collect()
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.expose(collected[name]))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Requests handled, by URL name, method and status code",
+    ["view", "method", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Request latency by URL name", ["view"]
+)
+DB_QUERIES = Histogram(
+    "db_queries_per_request",
+    "Database queries per request by URL name",
+    ["view"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_DURATION = Histogram(
+    "db_duration_seconds", "Database time per request by URL name", ["view"]
+)
+PAGE_CACHE_REQUESTS = Counter(
+    "page_cache_requests_total", "Anonymous page cache lookups", ["result"]
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Two-tier cache lookups by namespace and the tier that answered",
+    ["cache", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "cache_local_evictions_total",
+    "Entries evicted from a namespace's per-process LRU",
+    ["cache"],
+)
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total",
+    "Coalesced lookups: computed as leader, shared in-process or across "
+    "workers, or computed after waiting too long",
+    ["flight", "result"],
+)
+BOOKINGS_CREATED = Counter("bookings_created_total", "Bookings created")
+BOOKINGS_CANCELLED = Counter("bookings_cancelled_total", "Bookings cancelled by guests")
+BOOKING_CONFLICTS = Counter(
+    "booking_conflicts_total",
+    "Booking attempts rejected because the room was already taken",
+)
@@ -0,0 +1,250 @@
+# core/middleware.py
+import json
+import logging
+import mimetypes
+import random
+import re
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, Http404
+from django.utils.cache import patch_vary_headers
+
+from . import metrics
+from .db_router import REPLICA_PIN_COOKIE, begin_request, end_request, routing_state
+from .files import conditional_file_response, file_etag, resolve_file, set_file_headers
+from .instrumentation import (
+    NPlusOneError,
+    QueryRecorder,
+    collect_server_timing,
+    current_server_timing,
+)
+from .profiling import can_profile, is_profile_requested, run_profiled, save_profile
+
+sql_logger = logging.getLogger("core.sql")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class PrecompressedStaticMiddleware:
+    """Serve files from STATIC_ROOT, preferring the ``.gz`` variant.
+
+    Content-hashed names (``booking.3f2a9c1b7d4e.js``) never change, so they are
+    sent as immutable; everything else gets ``STATIC_CACHE_MAX_AGE``.
+    """
+
+    hashed_name_re = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = "/" + settings.STATIC_URL.lstrip("/")
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path_info.startswith(
+            self.prefix
+        ):
+            response = self.serve(request, request.path_info[len(self.prefix) :])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, path):
+        try:
+            fullpath, file_stat = resolve_file(settings.STATIC_ROOT, path)
+        except Http404:
+            return None
+
+        content_type, _ = mimetypes.guess_type(fullpath.name)
+        served_path, served_stat = fullpath, file_stat
+        gzip_path = fullpath.with_name(fullpath.name + ".gz")
+        has_gzip = gzip_path.is_file()
+        if has_gzip and self.accepts_gzip(request):
+            served_path, served_stat = gzip_path, gzip_path.stat()
+
+        etag = file_etag(served_stat)
+        response = conditional_file_response(request, served_stat, etag)
+        if response is None:
+            response = FileResponse(
+                served_path.open("rb"),
+                content_type=content_type or "application/octet-stream",
+                filename=fullpath.name,
+            )
+            if served_path is gzip_path:
+                response["Content-Encoding"] = "gzip"
+
+        set_file_headers(response, served_stat, etag=etag)
+        if self.hashed_name_re.search(fullpath.name):
+            response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response["Cache-Control"] = (
+                f"public, max-age={settings.STATIC_CACHE_MAX_AGE}"
+            )
+        if has_gzip:
+            patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+    @staticmethod
+    def accepts_gzip(request):
+        for coding in request.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = coding.strip().partition(";")
+            if name.strip() in ("gzip", "*") and params.replace(" ", "") != "q=0":
+                return True
+        return False
+
+
+class QueryInspectMiddleware:
+    """Record query count, DB time and repeated query shapes per request.
+
+    A sampled request emits one JSON log line on ``core.sql``; it is logged as a
+    warning when a shape repeats ``SQL_INSPECT_N_PLUS_ONE_THRESHOLD`` times.
+    With ``SQL_INSPECT_RAISE`` the request fails instead, which is meant for
+    test runs. With a sample rate of 0 the middleware removes itself.
+    """
+
+    def __init__(self, get_response):
+        if settings.SQL_INSPECT_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.SQL_INSPECT_SAMPLE_RATE:
+            return self.get_response(request)
+
+        with QueryRecorder().record() as recorder:
+            response = self.get_response(request)
+
+        summary = recorder.summary(settings.SQL_INSPECT_N_PLUS_ONE_THRESHOLD)
+        sql_logger.log(
+            logging.WARNING if summary["n_plus_one"] else logging.INFO,
+            json.dumps(
+                {
+                    "event": "sql_inspect",
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    **summary,
+                }
+            ),
+        )
+
+        if summary["n_plus_one"] and settings.SQL_INSPECT_RAISE:
+            repeated = summary["repeated"][0]
+            raise NPlusOneError(
+                f"{request.path}: query repeated {repeated['count']} times: "
+                f"{repeated['fingerprint']}"
+            )
+        return response
+
+
+class ServerTimingMiddleware:
+    """Attach a Server-Timing header with db, template, cache and app timers.
+
+    Application code reports its own phases with ``core.instrumentation.timer``.
+    Enabled with ``SERVER_TIMING_ENABLED``; otherwise the middleware removes
+    itself.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with collect_server_timing() as timing, QueryRecorder().record() as queries:
+            response = self.get_response(request)
+
+        timing.add("db", queries.duration, f"{queries.count} queries")
+        timing.add("total", time.perf_counter() - started)
+        response["Server-Timing"] = timing.header()
+        return response
+
+    def process_template_response(self, request, response):
+        timing = current_server_timing()
+        started = time.perf_counter()
+
+        def record_render(response):
+            timing.add("template", time.perf_counter() - started)
+
+        response.add_post_render_callback(record_render)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Scope core.db_router state to the request and carry writes forward.
+
+    A request that wrote sets a short-lived cookie so the visitor's next
+    requests (typically the redirect after a POST) also read from the primary
+    until the replicas have caught up. Removed when no replicas are configured.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = begin_request(pinned=REPLICA_PIN_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+            if routing_state().wrote:
+                response.set_cookie(
+                    REPLICA_PIN_COOKIE,
+                    "1",
+                    max_age=settings.REPLICA_PIN_SECONDS,
+                    httponly=True,
+                    samesite="Lax",
+                )
+        finally:
+            end_request(token)
+        return response
+
+
+class MetricsMiddleware:
+    """Feed request latency, status and DB usage per URL name into core.metrics"""
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with QueryRecorder(count_only=True).record() as queries:
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        metrics.HTTP_REQUESTS.inc(
+            view=view, method=request.method, status=response.status_code
+        )
+        metrics.HTTP_REQUEST_DURATION.observe(elapsed, view=view)
+        metrics.DB_QUERIES.observe(queries.count, view=view)
+        metrics.DB_DURATION.observe(queries.duration, view=view)
+        return response
+
+
+class ProfilerMiddleware:
+    """Run a single request under cProfile when a Manager asks for it.
+
+    Send ``X-Profile: 1`` or add ``?_profile=1``; the capture and its SQL log
+    are saved to ``PROFILE_DIR`` and listed at ``admin/profiles/``. Needs
+    ``request.user``, so it sits after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not (is_profile_requested(request) and can_profile(request.user)):
+            return self.get_response(request)
+
+        response, profiler, recorder, elapsed = run_profiled(self.get_response, request)
+        response["X-Profile-Id"] = save_profile(
+            request, response, profiler, recorder, elapsed
+        )
+        return response
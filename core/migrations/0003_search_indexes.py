@@ -0,0 +1,32 @@
+from django.db import migrations
+
+from core.indexes import CreateRawIndexes, trigram_index
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0002_delete_sitesetting"),
+    ]
+
+    operations = [
+        CreateRawIndexes(
+            [
+                trigram_index(
+                    "core_notification_title_trgm_idx", "core_notification", "title"
+                ),
+                trigram_index(
+                    "core_notification_message_trgm_idx", "core_notification", "message"
+                ),
+                trigram_index("core_contact_name_trgm_idx", "core_contact", "name"),
+                trigram_index("core_contact_email_trgm_idx", "core_contact", "email"),
+                trigram_index(
+                    "core_contact_subject_trgm_idx", "core_contact", "subject"
+                ),
+                trigram_index(
+                    "core_contact_message_trgm_idx", "core_contact", "message"
+                ),
+            ]
+        ),
+    ]
@@ -0,0 +1,63 @@
+# core/paginator.py
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+
+def planner_estimate(queryset):
+    """Row count PostgreSQL's planner keeps for the table, or None.
+
+    ``pg_class.reltuples`` is refreshed by ANALYZE/autovacuum and reads in
+    constant time; it is -1 for a table that has never been analyzed.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts planner statistics for large unfiltered lists.
+
+    An exact ``COUNT(*)`` on a table with tens of millions of rows scans the
+    whole table on every changelist load. When the list is unfiltered and the
+    estimate is at least ``ADMIN_ESTIMATED_COUNT_THRESHOLD`` the estimate is
+    used; filtered lists, small tables and other databases count exactly.
+    Pair it with ``show_full_result_count = False`` on the ModelAdmin.
+    """
+
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet) and not self.object_list.query.where:
+            estimate = planner_estimate(self.object_list)
+            if (
+                estimate is not None
+                and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+            ):
+                return estimate
+        return super().count
+
+
+class CappedCountPaginator(Paginator):
+    """Paginator that never counts past ``max_count`` rows.
+
+    The count becomes ``SELECT COUNT(*) FROM (... LIMIT max_count)``, so its
+    cost is bounded however broad the filter, and only the first
+    ``max_count`` rows can be paged through.
+    """
+
+    def __init__(self, object_list, per_page, max_count=100, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.max_count = max_count
+
+    @cached_property
+    def count(self):
+        return self.object_list[: self.max_count].count()
@@ -0,0 +1,142 @@
+# core/profiling.py
+import cProfile
+import json
+import pstats
+import re
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+from .instrumentation import QueryRecorder
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "_profile"
+PROFILE_NAME_RE = re.compile(r"^\d{8}-\d{6}-[0-9a-f]{8}$")
+
+
+def can_profile(user):
+    """Same audience as the staff dashboard: superusers and staff Managers"""
+    if not user.is_authenticated:
+        return False
+    if user.is_superuser:
+        return True
+    return user.is_staff and user.groups.filter(name="Managers").exists()
+
+
+def is_profile_requested(request):
+    return (
+        request.headers.get(PROFILE_HEADER) == "1"
+        or request.GET.get(PROFILE_QUERY_PARAM) == "1"
+    )
+
+
+def profile_directory():
+    return Path(settings.PROFILE_DIR)
+
+
+def profile_paths(name):
+    directory = profile_directory()
+    return directory / f"{name}.prof", directory / f"{name}.json"
+
+
+def save_profile(request, response, profiler, recorder, elapsed):
+    """Write ``<name>.prof`` and its ``<name>.json`` SQL log, then rotate"""
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    prof_path, log_path = profile_paths(name)
+    prof_path.parent.mkdir(parents=True, exist_ok=True)
+
+    profiler.dump_stats(prof_path)
+    log_path.write_text(
+        json.dumps(
+            {
+                "name": name,
+                "method": request.method,
+                "path": request.get_full_path(),
+                "user": request.user.get_username(),
+                "status": response.status_code,
+                "created": time.time(),
+                "duration_ms": round(elapsed * 1000, 2),
+                "db_time_ms": round(recorder.duration * 1000, 2),
+                "query_count": recorder.count,
+                "queries": recorder.queries,
+            }
+        )
+    )
+    rotate_profiles(settings.PROFILE_KEEP)
+    return name
+
+
+def rotate_profiles(keep):
+    """Delete all but the ``keep`` most recent captures"""
+    logs = sorted(profile_directory().glob("*.json"), reverse=True)
+    for log_path in logs[keep:]:
+        log_path.with_suffix(".prof").unlink(missing_ok=True)
+        log_path.unlink(missing_ok=True)
+
+
+def list_profiles():
+    directory = profile_directory()
+    if not directory.exists():
+        return []
+    profiles = []
+    for log_path in sorted(directory.glob("*.json"), reverse=True):
+        try:
+            entry = json.loads(log_path.read_text())
+        except (OSError, ValueError):
+            continue
+        entry.pop("queries", None)
+        profiles.append(entry)
+    return profiles
+
+
+def load_profile(name):
+    """Return the SQL log for ``name`` or None if it is unknown or rotated out"""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    _, log_path = profile_paths(name)
+    try:
+        return json.loads(log_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def top_functions(name, limit=40):
+    """Functions of a capture sorted by cumulative time, like ``pstats`` prints.
+
+    Returns None if the ``.prof`` file was rotated out or is only partly written.
+    """
+    prof_path, _ = profile_paths(name)
+    try:
+        stats = pstats.Stats(str(prof_path))
+    except (OSError, EOFError, TypeError, ValueError):
+        return None
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        primitive_calls, calls, total_time, cumulative_time, _ = stats.stats[func]
+        rows.append(
+            {
+                "function": pstats.func_std_string(func),
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "tottime_ms": round(total_time * 1000, 2),
+                "cumtime_ms": round(cumulative_time * 1000, 2),
+            }
+        )
+    return {
+        "total_calls": stats.total_calls,
+        "total_time_ms": round(stats.total_tt * 1000, 2),
+        "functions": rows,
+    }
+
+
+def run_profiled(get_response, request):
+    """Run the rest of the middleware chain under cProfile with the SQL captured"""
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    with QueryRecorder(capture_sql=True).record() as recorder:
+        response = profiler.runcall(get_response, request)
+    elapsed = time.perf_counter() - started
+    return response, profiler, recorder, elapsed
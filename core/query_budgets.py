@@ -0,0 +1,76 @@
+# core/query_budgets.py
+from django.urls import reverse
+
+QUERY_BUDGETS = []
+
+ROLES = ("anonymous", "guest", "manager", "admin")
+
+
+class QueryBudget:
+    """The most queries one URL may issue, however many rows it shows.
+
+    ``data`` names the rows the page lists (``rooms``, ``bookings``,
+    ``notifications``, ``users``); the budget test renders the page with one
+    row and with ``page_size + 1`` rows and requires the same count both times.
+    """
+
+    def __init__(
+        self,
+        url_name,
+        max_queries,
+        data,
+        role="anonymous",
+        page_size=None,
+        params=None,
+        htmx=False,
+    ):
+        if role not in ROLES:
+            raise ValueError(f"Unknown role {role!r}")
+        self.url_name = url_name
+        self.max_queries = max_queries
+        self.data = data
+        self.role = role
+        self.page_size = page_size
+        self.params = params or {}
+        self.htmx = htmx
+
+    @property
+    def sizes(self):
+        return (1, (self.page_size or 4) + 1)
+
+    @property
+    def url(self):
+        return reverse(self.url_name)
+
+    @property
+    def headers(self):
+        return {"HX-Request": "true"} if self.htmx else {}
+
+    def __str__(self):
+        return self.url_name + (" (htmx)" if self.htmx else "")
+
+
+def register_budget(url_name, max_queries, data, **options):
+    budget = QueryBudget(url_name, max_queries, data, **options)
+    QUERY_BUDGETS.append(budget)
+    return budget
+
+
+# Counts include the session and user lookups of logged-in requests and the
+# unread-notification count from the context processor
+register_budget("core:home", 2, "rooms")
+register_budget("rooms:room_list", 3, "rooms", page_size=9)
+register_budget("rooms:room_list", 3, "rooms", page_size=9, htmx=True)
+register_budget("rooms:room_manage", 8, "rooms", role="manager", page_size=20)
+register_budget("bookings:booking_list", 5, "bookings", role="guest", page_size=10)
+register_budget("accounts:profile", 6, "bookings", role="guest")
+register_budget("core:notifications", 6, "notifications", role="guest", page_size=10)
+register_budget("core:dashboard", 7, "bookings", role="manager")
+register_budget("bookings:tape_chart", 5, "bookings", role="manager", page_size=50)
+register_budget(
+    "admin:analytics_bookingstatistics_changelist", 11, "bookings", role="admin"
+)
+register_budget("admin:bookings_booking_changelist", 6, "bookings", role="admin")
+register_budget("admin:rooms_room_changelist", 9, "rooms", role="admin")
+register_budget("admin:core_notification_changelist", 6, "notifications", role="admin")
+register_budget("admin:auth_user_changelist", 9, "users", role="admin", page_size=10)
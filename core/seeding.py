@@ -0,0 +1,295 @@
+# core/seeding.py
+from contextlib import contextmanager
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from itertools import islice
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from bookings.models import Booking
+from rooms.models import Room
+
+from .models import Notification
+
+ROOM_TYPES = {
+    # room_type: (bed_type, base price, adults, children, share of rooms)
+    "single": ("single", 60, 1, 0, 0.25),
+    "double": ("queen", 95, 2, 1, 0.4),
+    "suite": ("king", 220, 2, 2, 0.1),
+    "family": ("double", 150, 4, 3, 0.25),
+}
+FUTURE_DAYS = 180
+MAX_NIGHTS = 14
+
+
+@contextmanager
+def explicit_timestamps(model, *field_names):
+    """Let bulk_create keep the given auto_now/auto_now_add values"""
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def can_copy():
+    """psycopg 3 exposes ``cursor.copy()`` for ``COPY ... FROM STDIN``"""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        return hasattr(cursor.cursor, "copy")
+
+
+def insert_objects(model, objects, batch_size):
+    """Insert unsaved instances in chunks, streaming them through COPY if possible.
+
+    Signals, ``save()`` and ``clean()`` are skipped either way.
+    """
+    if not can_copy():
+        total = 0
+        for chunk in chunked(objects, batch_size):
+            model.objects.bulk_create(chunk, batch_size=batch_size)
+            total += len(chunk)
+        return total
+
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    sql = (
+        f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN"
+    )
+    total = 0
+    with connection.cursor() as cursor, cursor.cursor.copy(sql) as copy:
+        for obj in objects:
+            copy.write_row(
+                [
+                    field.get_db_prep_save(getattr(obj, field.attname), connection)
+                    for field in fields
+                ]
+            )
+            total += 1
+    return total
+
+
+def seasonality(day_of_year, weekday):
+    """Relative demand: a summer peak, a winter trough and busier weekends"""
+    season = 1 + 0.35 * np.cos(2 * np.pi * (day_of_year - 200) / 365)
+    return season * np.where(weekday >= 4, 1.3, 1.0)
+
+
+def build_schedules(rng, room_count, target, start, span):
+    """Draw non-overlapping stays for every room at once.
+
+    Each room first gets a back-to-back schedule of stays separated by short
+    gaps; stays are then kept with a probability driven by the season, the
+    check-in weekday and the room's popularity, scaled to hit ``target``.
+    Dropping stays can never create an overlap. Returns the room index,
+    check-in offset in days and length of each kept stay.
+    """
+    slots = int(span / 2.5) + 1
+    nights = np.minimum(rng.geometric(1 / 3, size=(room_count, slots)), MAX_NIGHTS)
+    gaps = rng.geometric(0.6, size=(room_count, slots)) - 1
+    check_in = np.cumsum(gaps + nights, axis=1) - nights
+    valid = check_in + nights <= span
+
+    popularity = rng.gamma(2.0, 0.5, size=(room_count, 1))
+    days = np.datetime64(start) + check_in
+    day_of_year = (days - days.astype("datetime64[Y]")).astype(int)
+    weekday = (days.astype(int) + 3) % 7  # 1970-01-01 was a Thursday
+    weights = seasonality(day_of_year, weekday) * popularity * valid
+
+    probability = np.minimum(1.0, weights * (target / max(weights.sum(), 1e-9)))
+    kept = rng.random(weights.shape) < probability
+    rooms, slot = np.nonzero(kept)
+    return rooms, check_in[rooms, slot], nights[rooms, slot]
+
+
+def seed_hotel(
+    rooms=200,
+    bookings=5000,
+    years=2,
+    seed=42,
+    users=None,
+    notifications=True,
+    batch_size=5000,
+):
+    """Bulk-insert a deterministic hotel: guests, rooms, bookings and notifications.
+
+    Stays never overlap within a room and span the last ``years`` years plus
+    the next six months, with seasonal demand, per-room popularity, gamma
+    distributed booking lead times and lead-time dependent cancellations.
+    ``bookings`` is a target; capacity can cap the actual count.
+    """
+    rng = np.random.default_rng(seed)
+    now = timezone.now()
+    today = timezone.localdate()
+    span = 365 * years + FUTURE_DAYS
+    start = today - timedelta(days=span - FUTURE_DAYS)
+    user_count = users or max(1, bookings // 5)
+    counts = {}
+
+    with transaction.atomic():
+        password = make_password(None)
+        for chunk in chunked(range(user_count), batch_size):
+            User.objects.bulk_create(
+                [
+                    User(
+                        username=f"guest-{n:07d}",
+                        email=f"guest-{n}@example.com",
+                        password=password,
+                        date_joined=now,
+                    )
+                    for n in chunk
+                ],
+                ignore_conflicts=True,
+            )
+        user_ids = np.array(
+            User.objects.filter(username__startswith="guest-")
+            .order_by("pk")
+            .values_list("pk", flat=True)[:user_count]
+        )
+        counts["users"] = len(user_ids)
+
+        # Rooms
+        type_names = list(ROOM_TYPES)
+        shares = np.array([ROOM_TYPES[name][4] for name in type_names])
+        room_types = rng.choice(len(type_names), size=rooms, p=shares / shares.sum())
+        markups = rng.integers(0, 40, size=rooms)
+        offset = Room.objects.count()
+        room_objects = []
+        for n, (type_index, markup) in enumerate(zip(room_types, markups)):
+            room_type = type_names[type_index]
+            bed_type, price, adults, children, _ = ROOM_TYPES[room_type]
+            room_objects.append(
+                Room(
+                    name=f"{room_type.title()} {offset + n + 1}",
+                    room_number=f"S{offset + n:05d}",
+                    floor=(offset + n) // 50 + 1,
+                    room_type=room_type,
+                    bed_type=bed_type,
+                    price_per_night=Decimal(int(price + markup)),
+                    capacity_adults=adults,
+                    capacity_children=children,
+                    created_at=now,
+                )
+            )
+        room_objects = Room.objects.bulk_create(room_objects, batch_size=batch_size)
+        counts["rooms"] = len(room_objects)
+
+        # Bookings
+        room_index, check_in, nights = build_schedules(
+            rng, rooms, bookings, start, span
+        )
+        total = len(room_index)
+        lead_days = rng.gamma(2.0, 15.0, size=total)
+        check_in_days = np.datetime64(start) + check_in
+        booked_at = check_in_days.astype("datetime64[s]") - (lead_days * 86400).astype(
+            "timedelta64[s]"
+        )
+        booked_at = np.minimum(booked_at, np.datetime64(now.replace(tzinfo=None), "s"))
+
+        past = check_in + nights < (today - start).days
+        cancelled = rng.random(total) < np.clip(0.04 + lead_days / 300, 0, 0.4)
+        confirmed = rng.random(total) < 0.7
+        status = np.where(
+            cancelled,
+            "cancelled",
+            np.where(past, "completed", np.where(confirmed, "confirmed", "pending")),
+        )
+
+        adults_cap = np.array([room.capacity_adults for room in room_objects])
+        children_cap = np.array([room.capacity_children for room in room_objects])
+        adults = 1 + (rng.random(total) * adults_cap[room_index]).astype(int)
+        children = (rng.random(total) * (children_cap[room_index] + 1)).astype(int)
+        guests = user_ids[rng.integers(0, len(user_ids), size=total)]
+
+        prices = [room.price_per_night for room in room_objects]
+        check_in_dates = check_in_days.astype(object)
+        check_out_dates = (check_in_days + nights).astype(object)
+        created = [
+            value.replace(tzinfo=dt_timezone.utc) for value in booked_at.astype(object)
+        ]
+        rows = zip(
+            room_index.tolist(),
+            guests.tolist(),
+            check_in_dates,
+            check_out_dates,
+            nights.tolist(),
+            adults.tolist(),
+            children.tolist(),
+            status.tolist(),
+            created,
+        )
+
+        with explicit_timestamps(Booking, "created_at", "updated_at"):
+            counts["bookings"] = insert_objects(
+                Booking,
+                (
+                    Booking(
+                        user_id=user_id,
+                        room_id=room_objects[index].pk,
+                        check_in=day_in,
+                        check_out=day_out,
+                        adults=adult_count,
+                        children=child_count,
+                        status=state,
+                        total_price=prices[index] * stay,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+                    for (
+                        index,
+                        user_id,
+                        day_in,
+                        day_out,
+                        stay,
+                        adult_count,
+                        child_count,
+                        state,
+                        created_at,
+                    ) in rows
+                ),
+                batch_size,
+            )
+
+        counts["notifications"] = 0
+        if notifications:
+            with explicit_timestamps(Notification, "created_at"):
+                counts["notifications"] = insert_objects(
+                    Notification,
+                    (
+                        Notification(
+                            user_id=user_id,
+                            type="booking",
+                            title=f"Booking {state}",
+                            message=f"Your stay from {day_in} to {day_out} is {state}.",
+                            read=is_past,
+                            created_at=created_at,
+                        )
+                        for user_id, day_in, day_out, state, is_past, created_at in zip(
+                            guests.tolist(),
+                            check_in_dates,
+                            check_out_dates,
+                            status.tolist(),
+                            past.tolist(),
+                            created,
+                        )
+                    ),
+                    batch_size,
+                )
+
+    return counts
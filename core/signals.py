@@ -0,0 +1,42 @@
+# core/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bookings.models import Booking
+from rooms.models import Room, RoomImage
+
+from . import metrics
+from .cache import invalidate_memoized, invalidate_tags
+from .singleflight import invalidate_flights
+
+
+@receiver([post_save, post_delete], sender=Room)
+def invalidate_room_pages(sender, instance, **kwargs):
+    invalidate_tags("home", "room_list", f"room:{instance.pk}")
+    invalidate_memoized("catalog", f"room:{instance.pk}")
+    invalidate_memoized("analytics", "rooms")
+
+
+@receiver([post_save, post_delete], sender=RoomImage)
+def invalidate_room_image_pages(sender, instance, **kwargs):
+    invalidate_tags(
+        "home",
+        "room_list",
+        f"room:{instance.room_id}",
+        f"room-images:{instance.room_id}",
+    )
+    invalidate_memoized("catalog", f"room-images:{instance.room_id}")
+
+
+@receiver(post_save, sender=Booking)
+def count_created_bookings(sender, instance, created, **kwargs):
+    if created:
+        metrics.BOOKINGS_CREATED.inc()
+
+
+@receiver([post_save, post_delete], sender=Booking)
+def invalidate_availability_pages(sender, instance, **kwargs):
+    # Bookings only affect date-filtered listings and the booked-dates calendar
+    invalidate_tags("room_list", f"room:{instance.room_id}")
+    invalidate_memoized("analytics", "bookings")
+    invalidate_flights(f"availability:{instance.room_id}")
@@ -0,0 +1,130 @@
+# core/singleflight.py
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import metrics
+from .cache import invalidate_tags, tag_versions
+
+_MISSING = object()
+SHARED_POLL_INTERVAL = 0.01
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run concurrent calls with the same key once per process.
+
+    The first caller computes; callers arriving while it runs wait for its
+    result (or exception) instead of repeating the work. Nothing is kept once
+    the call finishes.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            metrics.SINGLE_FLIGHT_CALLS.inc(flight=self.name, result="process")
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func()
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+
+def shared_flight(name, key, func, tags=(), cache=None):
+    """Share one computation of ``key`` between workers through the cache.
+
+    The worker that wins a short-lived lock computes and publishes the result
+    for ``SINGLE_FLIGHT_RESULT_TIMEOUT`` seconds; others poll for it for up to
+    ``SINGLE_FLIGHT_WAIT`` seconds and then compute it themselves. The result
+    key includes the version of ``tags``, so ``invalidate_flights`` makes
+    later callers recompute at once.
+    """
+    cache = cache or caches["default"]
+    versions = ":".join(tag_versions(tags, cache))
+    result_key = f"flight:{name}:{key}:{versions}"
+    lock_key = f"{result_key}:lock"
+
+    value = cache.get(result_key, _MISSING)
+    if value is not _MISSING:
+        metrics.SINGLE_FLIGHT_CALLS.inc(flight=name, result="shared")
+        return value
+
+    # The lock outlives the followers' wait and expires if the leader dies
+    if cache.add(lock_key, True, settings.SINGLE_FLIGHT_WAIT + 1):
+        try:
+            value = func()
+            cache.set(result_key, value, settings.SINGLE_FLIGHT_RESULT_TIMEOUT)
+        finally:
+            cache.delete(lock_key)
+        metrics.SINGLE_FLIGHT_CALLS.inc(flight=name, result="leader")
+        return value
+
+    deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(SHARED_POLL_INTERVAL)
+        value = cache.get(result_key, _MISSING)
+        if value is not _MISSING:
+            metrics.SINGLE_FLIGHT_CALLS.inc(flight=name, result="shared")
+            return value
+
+    # The leader is slow or died; don't leave the visitor waiting on it
+    metrics.SINGLE_FLIGHT_CALLS.inc(flight=name, result="timeout")
+    return func()
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def coalesce(name, key, func, tags=()):
+    """Compute ``func`` once for concurrent identical ``key`` lookups.
+
+    Calls are coalesced within the process by a ``SingleFlight`` named
+    ``name`` and between processes by ``shared_flight``. Off with
+    ``SINGLE_FLIGHT_ENABLED = False``.
+
+    Results and tag versions live in the shared ``default`` cache rather than
+    a two-tier namespace. Another worker could otherwise keep a tag version
+    in its local tier for ``CACHE_LOCAL_TIMEOUT`` seconds after a booking and
+    report the room free from a result published before it.
+    """
+    if not settings.SINGLE_FLIGHT_ENABLED:
+        return func()
+
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = _flights[name] = SingleFlight(name)
+    return flight.do(key, lambda: shared_flight(name, key, func, tags))
+
+
+def invalidate_flights(*tags):
+    invalidate_tags(*tags, cache=caches["default"])
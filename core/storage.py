@@ -0,0 +1,52 @@
+# core/storage.py
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Content-hashed static files with a precompressed ``.gz`` beside each one.
+
+    The ``.gz`` variants are written once at ``collectstatic`` time and picked up
+    by ``core.middleware.PrecompressedStaticMiddleware``.
+    """
+
+    compressible_extensions = (".css", ".js", ".json", ".map", ".svg", ".txt", ".xml")
+    min_compress_size = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed_names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if not isinstance(processed, Exception):
+                processed_names.add(hashed_name or name)
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+
+        for name in processed_names.union(paths):
+            self.compress(name)
+
+    def compress(self, name):
+        """Write ``name.gz`` when gzip actually makes the file smaller"""
+        if not name.endswith(self.compressible_extensions) or not self.exists(name):
+            return None
+
+        with self.open(name) as original:
+            data = original.read()
+        if len(data) < self.min_compress_size:
+            return None
+
+        # mtime=0 keeps the output byte-identical across deploys
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(compressed) >= len(data) * 0.95:
+            return None
+
+        gz_name = f"{name}.gz"
+        if self.exists(gz_name):
+            self.delete(gz_name)
+        self._save(gz_name, ContentFile(compressed))
+        return gz_name
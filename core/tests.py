@@ -1,16 +1,78 @@
 # core/tests.py
-from datetime import datetime, timedelta
+import gzip
+import json
+import logging
+import re
+import subprocess
+import sys
+import threading
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from io import StringIO
 
+import numpy as np
 import pytest
-from django.contrib.auth.models import User
+from django.contrib.auth.models import Group, User
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError, connection
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
 from bookings.models import Booking
-from rooms.models import Room
+from rooms.models import Room, RoomImage
 
+from .autocomplete import AUTOCOMPLETE_MAX_RESULTS
+from .benchmarks import compare, run_benchmarks
+from .cache import (
+    cache_stats,
+    invalidate_memoized,
+    memoize,
+    page_cache_stats,
+    refresh_lock_key,
+    stale_while_revalidate,
+)
+from .cache_backends import TwoTierCache
+from .dashboard import WINDOW_DAYS, compute_snapshot, get_snapshot, refresh_snapshot
+from .db_router import (
+    REPLICA_PIN_COOKIE,
+    PrimaryReplicaRouter,
+    begin_request,
+    end_request,
+    replica_reads,
+)
+from .instrumentation import (
+    NPlusOneError,
+    collect_server_timing,
+    detect_n_plus_one,
+    fingerprint,
+    timer,
+)
+from .loadtest import (
+    connection_profile,
+    find_overlaps,
+    run_availability_benchmark,
+    run_load_test,
+)
+from .metrics import (
+    BOOKINGS_CANCELLED,
+    BOOKINGS_CREATED,
+    HTTP_REQUEST_DURATION,
+    REGISTRY,
+    SINGLE_FLIGHT_CALLS,
+)
+from .middleware import QueryInspectMiddleware
 from .models import Contact, Notification
+from .paginator import EstimatedCountPaginator, planner_estimate
+from .query_budgets import QUERY_BUDGETS
+from .seeding import build_schedules, seed_hotel
+from .singleflight import SingleFlight, invalidate_flights, shared_flight
 
 
 @pytest.fixture
@@ -99,6 +161,108 @@ class TestDashboard:
         assert "month_revenue" in response.context
         assert "occupancy_rate" in response.context
 
+    def test_snapshot_one_query_per_table(self, admin_user, test_room, test_booking):
+        """Test the snapshot aggregates rooms and bookings in one query each"""
+        with CaptureQueriesContext(connection) as queries:
+            snapshot = compute_snapshot()
+
+        assert len(queries) == 2
+        assert snapshot["total_rooms"] == 1
+        assert snapshot["bookings_today"] == 1
+        assert snapshot["bookings_month"] == 1
+        assert snapshot["month_revenue"] == Decimal("200.00")
+
+    def test_snapshot_room_night_occupancy(self, admin_user, test_room):
+        """Test occupancy counts the nights of each stay inside the window"""
+        today = timezone.localdate()
+        Booking.objects.bulk_create(
+            [
+                # 10 nights, 5 of them before the window opened
+                Booking(
+                    user=admin_user,
+                    room=test_room,
+                    adults=1,
+                    check_in=today - timedelta(days=WINDOW_DAYS + 5),
+                    check_out=today - timedelta(days=WINDOW_DAYS - 5),
+                    status="completed",
+                    total_price=Decimal("1000.00"),
+                ),
+                # 4 nights, 2 of them still to come
+                Booking(
+                    user=admin_user,
+                    room=test_room,
+                    adults=1,
+                    check_in=today - timedelta(days=2),
+                    check_out=today + timedelta(days=2),
+                    status="confirmed",
+                    total_price=Decimal("400.00"),
+                ),
+                Booking(
+                    user=admin_user,
+                    room=test_room,
+                    adults=1,
+                    check_in=today - timedelta(days=10),
+                    check_out=today - timedelta(days=5),
+                    status="cancelled",
+                    total_price=Decimal("500.00"),
+                ),
+            ]
+        )
+
+        snapshot = compute_snapshot()
+
+        assert snapshot["booked_nights"] == 7
+        assert snapshot["occupancy_rate"] == pytest.approx(7 / WINDOW_DAYS * 100)
+
+    def test_stale_snapshot_refreshes_in_background(
+        self, monkeypatch, settings, admin_user, test_room
+    ):
+        """Test a stale snapshot is served while one refresh runs"""
+        refreshes = []
+        monkeypatch.setattr(
+            "core.cache.run_in_background", lambda func: refreshes.append(func)
+        )
+        settings.DASHBOARD_SNAPSHOT_TTL = 30
+        assert get_snapshot()["total_rooms"] == 1
+
+        Room.objects.filter(pk=test_room.pk).update(is_active=False)
+        assert get_snapshot()["available_rooms"] == 1
+        assert refreshes == []
+
+        settings.DASHBOARD_SNAPSHOT_TTL = 0
+        refresh_snapshot()
+        Room.objects.update(is_active=True)
+        assert get_snapshot()["available_rooms"] == 0
+        assert get_snapshot()["available_rooms"] == 0
+        assert len(refreshes) == 1
+
+        refreshes[0]()
+        assert caches["default"].get("dashboard:snapshot")[1]["available_rooms"] == 1
+
+    def test_dashboard_tiles_partial(self, client, manager_user, test_room):
+        """Test the polled tiles render from the cached snapshot"""
+        client.login(username="manager", password="manager123")
+        client.get(reverse("core:dashboard"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                reverse("core:dashboard_tiles"), headers={"HX-Request": "true"}
+            )
+
+        assert response.status_code == 200
+        assert b"dashboard-tiles" in response.content
+        assert b"<html" not in response.content
+        assert not any("rooms_room" in query["sql"] for query in queries)
+
+    def test_dashboard_tiles_require_manager(self, client, test_room):
+        """Test guests cannot poll the dashboard tiles"""
+        User.objects.create_user(username="guest", password="guest123")
+        client.login(username="guest", password="guest123")
+
+        response = client.get(reverse("core:dashboard_tiles"))
+
+        assert response.status_code == 403
+
 
 @pytest.mark.django_db
 class TestContact:
@@ -226,3 +390,1293 @@ class TestModels:
         )
         assert str(notification) == f"Test Notification - {admin_user.username}"
         assert notification.read == False
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / "room_images").mkdir()
+    (tmp_path / "room_images" / "photo.jpg").write_bytes(b"\xff\xd8jpeg-bytes")
+    (tmp_path / "private").mkdir()
+    (tmp_path / "private" / "report.pdf").write_bytes(b"%PDF")
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestMediaServing:
+    url = "/media/room_images/photo.jpg"
+
+    def test_file_response_fallback(self, client, media_root):
+        """Test media is streamed with validators when no front server is used"""
+        response = client.get(self.url)
+
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == b"\xff\xd8jpeg-bytes"
+        assert response["Content-Type"] == "image/jpeg"
+        assert response["ETag"]
+        assert response["Last-Modified"]
+
+    def test_conditional_request(self, client, media_root):
+        """Test matching validators return 304 without a body"""
+        etag = client.get(self.url)["ETag"]
+        response = client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_x_accel_redirect(self, client, media_root, settings):
+        """Test nginx hand-off sends headers only"""
+        settings.MEDIA_SERVE_MODE = "x-accel"
+        response = client.get(self.url)
+
+        assert response.status_code == 200
+        assert response["X-Accel-Redirect"] == "/protected-media/room_images/photo.jpg"
+        assert response.content == b""
+        assert response["ETag"]
+
+    def test_x_sendfile(self, client, media_root, settings):
+        """Test Apache/lighttpd hand-off points at the resolved file"""
+        settings.MEDIA_SERVE_MODE = "x-sendfile"
+        response = client.get(self.url)
+
+        assert response["X-Sendfile"] == str(media_root / "room_images" / "photo.jpg")
+        assert response.content == b""
+
+    def test_compressed_upload_is_not_content_encoded(self, client, media_root):
+        """Test a .tar.gz is sent as a gzip file, not gzip-encoded content"""
+        (media_root / "room_images" / "backup.tar.gz").write_bytes(b"\x1f\x8b")
+        response = client.get("/media/room_images/backup.tar.gz")
+
+        assert response["Content-Type"] == "application/gzip"
+        assert not response.has_header("Content-Encoding")
+
+    def test_missing_and_traversal(self, client, media_root):
+        """Test unknown files and paths outside MEDIA_ROOT are not served"""
+        assert client.get("/media/room_images/missing.jpg").status_code == 404
+        assert client.get("/media/room_images/../../etc/passwd").status_code == 404
+        assert client.get("/media/room_images/").status_code == 404
+
+    def test_private_directory_requires_staff(self, client, media_root, admin_user):
+        """Test files outside public upload directories are staff-only"""
+        assert client.get("/media/private/report.pdf").status_code == 404
+
+        client.login(username="admin", password="admin123")
+        assert client.get("/media/private/report.pdf").status_code == 200
+
+
+@pytest.fixture
+def collected_static(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "core.storage.CompressedManifestStaticFilesStorage",
+        },
+    }
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return tmp_path
+
+
+class TestStaticAssets:
+    def test_collectstatic_writes_hashed_and_gzip_files(self, collected_static):
+        """Test collectstatic output has hashed names and .gz variants"""
+        manifest = json.loads((collected_static / "staticfiles.json").read_text())
+        hashed = manifest["paths"]["js/booking.js"]
+
+        assert re.search(r"booking\.[0-9a-f]{12}\.js$", hashed)
+        compressed = (collected_static / f"{hashed}.gz").read_bytes()
+        assert gzip.decompress(compressed) == (collected_static / hashed).read_bytes()
+        assert not (collected_static / "images" / "hero.jpeg.gz").exists()
+
+    def test_hashed_asset_served_precompressed(self, client, collected_static):
+        """Test gzip clients get the .gz file with immutable caching"""
+        manifest = json.loads((collected_static / "staticfiles.json").read_text())
+        url = "/static/" + manifest["paths"]["css/admin-custom.css"]
+
+        response = client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+
+        assert response.status_code == 200
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Content-Type"].startswith("text/css")
+        assert "immutable" in response["Cache-Control"]
+        assert "Accept-Encoding" in response["Vary"]
+
+        plain = client.get(url)
+        assert not plain.has_header("Content-Encoding")
+        assert plain["ETag"] != response["ETag"]
+
+    def test_unhashed_asset_gets_short_cache(self, client, collected_static, settings):
+        """Test plain names are revalidated instead of cached forever"""
+        response = client.get("/static/js/booking.js")
+
+        assert response.status_code == 200
+        assert response["Cache-Control"] == (
+            f"public, max-age={settings.STATIC_CACHE_MAX_AGE}"
+        )
+        assert (
+            client.get(
+                "/static/js/booking.js", HTTP_IF_NONE_MATCH=response["ETag"]
+            ).status_code
+            == 304
+        )
+
+
+@pytest.mark.django_db
+class TestPageCache:
+    def test_anonymous_home_is_cached(self, client, test_room):
+        """Test repeated anonymous requests are served from the page cache"""
+        first = client.get(reverse("core:home"))
+        second = client.get(reverse("core:home"))
+
+        assert first["X-Page-Cache"] == "MISS"
+        assert second["X-Page-Cache"] == "HIT"
+        assert second.content == first.content
+        assert page_cache_stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    def test_room_change_invalidates_home(self, client, test_room):
+        """Test saving a room drops the cached home page"""
+        client.get(reverse("core:home"))
+        test_room.name = "Renamed Room"
+        test_room.save()
+
+        response = client.get(reverse("core:home"))
+        assert response["X-Page-Cache"] == "MISS"
+        assert b"Renamed Room" in response.content
+
+    def test_authenticated_requests_bypass_cache(self, client, admin_user):
+        """Test personalized pages are never stored or served from cache"""
+        client.login(username="admin", password="admin123")
+        client.get(reverse("core:home"))
+        response = client.get(reverse("core:home"))
+
+        assert not response.has_header("X-Page-Cache")
+
+    def test_pages_with_messages_are_not_cached(self, client):
+        """Test a flash message is shown once and not baked into the cache"""
+        client.post(
+            reverse("core:contact"),
+            {
+                "name": "Test User",
+                "email": "test@example.com",
+                "subject": "Test Subject",
+                "message": "Test Message",
+            },
+        )
+        with_message = client.get(reverse("core:home"))
+        assert not with_message.has_header("X-Page-Cache")
+        assert b"Your message has been sent" in with_message.content
+
+        response = client.get(reverse("core:home"))
+        assert response["X-Page-Cache"] == "MISS"
+        assert b"Your message has been sent" not in response.content
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    return "replica"
+
+
+def replica_only_room(replica, **fields):
+    """A room that exists only on the replica, so reads reveal the database"""
+    return Room.objects.using(replica).create(
+        name="Replica Suite",
+        room_number="901",
+        floor=9,
+        room_type="suite",
+        bed_type="king",
+        price_per_night=Decimal("300.00"),
+        capacity_adults=2,
+        capacity_children=0,
+        **fields,
+    )
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+class TestReplicaRouting:
+    def test_anonymous_catalog_reads_replica(self, client, replica):
+        """Test anonymous catalog pages are served from the replica"""
+        replica_only_room(replica)
+
+        response = client.get(reverse("rooms:room_list"))
+
+        assert b"Replica Suite" in response.content
+        assert REPLICA_PIN_COOKIE not in response.cookies
+
+    def test_signed_in_catalog_reads_primary(self, client, admin_user, replica):
+        """Test signed-in visitors always read the primary"""
+        replica_only_room(replica)
+        client.login(username="admin", password="admin123")
+
+        response = client.get(reverse("rooms:room_list"))
+
+        assert b"Replica Suite" not in response.content
+
+    def test_availability_check_reads_primary(self, client, test_room, replica):
+        """Test availability checks on the write path ignore the replica"""
+        test_room.save(using=replica)
+        Booking.objects.create(
+            user=User.objects.create_user(username="guest", password="guest123"),
+            room_id=test_room.pk,
+            check_in=date.today() + timedelta(days=10),
+            check_out=date.today() + timedelta(days=12),
+            adults=1,
+            status="confirmed",
+            total_price=Decimal("200.00"),
+        )
+
+        response = client.get(
+            reverse("bookings:check_availability", args=[test_room.pk]),
+            {
+                "check_in": str(date.today() + timedelta(days=11)),
+                "check_out": str(date.today() + timedelta(days=13)),
+            },
+        )
+
+        assert response.json()["available"] is False
+
+    def test_year_data_reads_replica(self, client, admin_user, replica):
+        """Test analytics reads go to the replica"""
+        room = replica_only_room(replica)
+        admin_user.save(using=replica)
+        Booking.objects.using(replica).create(
+            user_id=admin_user.pk,
+            room=room,
+            check_in=date(2024, 3, 1),
+            check_out=date(2024, 3, 3),
+            adults=1,
+            status="confirmed",
+            total_price=Decimal("600.00"),
+        )
+        client.login(username="admin", password="admin123")
+
+        response = client.get(reverse("analytics:year_data", args=[2024]))
+
+        assert response.json()["chart_data"]["bookings"][2] == 1
+
+    def test_reads_after_write_use_primary(self, replica):
+        """Test a write pins the rest of the request to the primary"""
+        router = PrimaryReplicaRouter()
+        token = begin_request()
+        try:
+            with replica_reads():
+                assert router.db_for_read(Room) == replica
+                Contact.objects.create(
+                    name="Guest", email="guest@example.com", subject="Hi", message="Hi"
+                )
+                assert router.db_for_read(Room) == "default"
+        finally:
+            end_request(token)
+        assert router.db_for_read(Room) == "default"
+
+    def test_write_pins_next_requests_to_primary(self, client, replica):
+        """Test a request that wrote keeps the visitor on the primary"""
+        replica_only_room(replica)
+        response = client.post(
+            reverse("core:contact"),
+            {
+                "name": "Test User",
+                "email": "test@example.com",
+                "subject": "Test Subject",
+                "message": "Test Message",
+            },
+        )
+        assert REPLICA_PIN_COOKIE in response.cookies
+
+        response = client.get(reverse("rooms:room_list"))
+        assert b"Replica Suite" not in response.content
+
+
+@pytest.mark.django_db
+class TestTwoTierCache:
+    def test_local_tier_answers_before_shared(self):
+        """Test a value read once is served from the process-local LRU"""
+        cache = caches["catalog"]
+        cache.set("rates", [1, 2])
+        cache.local.clear()
+        # The process-local stats outlive the caches cleared between tests
+        before = cache_stats()["catalog"]
+
+        assert cache.get("rates") == [1, 2]
+        assert cache.get("rates") == [1, 2]
+        after = cache_stats()["catalog"]
+        assert after["shared_hits"] - before["shared_hits"] == 1
+        assert after["local_hits"] - before["local_hits"] == 1
+
+    def test_namespaces_do_not_collide(self):
+        """Test equal keys in two namespaces hold separate values"""
+        caches["catalog"].set("key", "catalog")
+        caches["analytics"].set("key", "analytics")
+
+        assert caches["catalog"].get("key") == "catalog"
+        assert caches["analytics"].get("key") == "analytics"
+
+    def test_local_tier_evicts_least_recently_used(self):
+        """Test the local tier stays within MAX_ENTRIES"""
+        cache = TwoTierCache("test-eviction", {"OPTIONS": {"MAX_ENTRIES": 2}})
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert len(cache.local) == 2
+        assert cache.stats()["evictions"] == 1
+        # Evicted locally, still in the shared tier
+        assert cache.get("b") == 2
+        assert cache.stats()["shared_hits"] == 1
+
+    def test_memoize_until_tag_invalidated(self):
+        """Test memoized results are reused until their tag is invalidated"""
+        calls = []
+
+        @memoize("analytics", tags=["series"])
+        def series(year):
+            calls.append(year)
+            return [year]
+
+        assert series(2024) == series(2024) == [2024]
+        assert series(2023) == [2023]
+        assert calls == [2024, 2023]
+
+        invalidate_memoized("analytics", "series")
+        series(2024)
+        assert calls == [2024, 2023, 2024]
+
+    def test_stale_value_kept_when_refresh_fails(self, monkeypatch):
+        """Test a failed refresh keeps the stale value and holds off retries"""
+        refreshes = []
+        monkeypatch.setattr(
+            "core.cache.run_in_background", lambda func: refreshes.append(func)
+        )
+        assert stale_while_revalidate("report", lambda: "old", 0) == "old"
+
+        def slow_database():
+            raise OperationalError("canceling statement due to statement timeout")
+
+        assert stale_while_revalidate("report", slow_database, 0) == "old"
+        refreshes.pop()()
+
+        assert stale_while_revalidate("report", slow_database, 0) == "old"
+        assert refreshes == []
+        assert caches["default"].get(refresh_lock_key("report"))
+
+    def test_room_helpers_are_memoized(self, test_room, django_assert_num_queries):
+        """Test image lookups and amenities hit the database once per change"""
+        RoomImage.objects.create(
+            room=test_room, image="room_images/photo.jpg", is_primary=True
+        )
+        RoomImage.objects.create(room=test_room, image="room_images/more.jpg", order=1)
+        room = Room.objects.get(pk=test_room.pk)
+        room.get_primary_image()
+
+        with django_assert_num_queries(0):
+            assert room.get_primary_image().is_primary
+            assert [image.order for image in room.get_gallery_images()] == [1]
+
+        assert ("Safe", "lock") not in room.get_amenities_list()
+        test_room.has_safe = True
+        test_room.save()
+        assert ("Safe", "lock") in Room.objects.get(
+            pk=test_room.pk
+        ).get_amenities_list()
+
+
+class CountingEvent(threading.Event):
+    def __init__(self):
+        super().__init__()
+        self.waiters = threading.Semaphore(0)
+
+    def wait(self, timeout=None):
+        self.waiters.release()
+        return super().wait(timeout)
+
+
+@pytest.mark.django_db
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_computation(self, fresh_metrics):
+        """Test callers arriving mid-computation wait for the leader's result"""
+        flight = SingleFlight("test")
+        started, release = threading.Event(), threading.Event()
+        calls, results = [], []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "free"
+
+        leader = threading.Thread(
+            target=lambda: results.append(flight.do("room-1", compute))
+        )
+        leader.start()
+        started.wait(5)
+        # Count followers as they start waiting on the in-flight call
+        flight._calls["room-1"].done = waiting = CountingEvent()
+        followers = [
+            threading.Thread(
+                target=lambda: results.append(flight.do("room-1", compute))
+            )
+            for _ in range(3)
+        ]
+        for follower in followers:
+            follower.start()
+        for _ in followers:
+            assert waiting.waiters.acquire(timeout=5)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        assert calls == [1]
+        assert results == ["free"] * 4
+        assert (
+            'single_flight_calls_total{flight="test",result="process"} 3'
+            in fresh_metrics.expose()
+        )
+
+    def test_result_shared_between_workers_until_invalidated(self, fresh_metrics):
+        """Test a published result is reused until its tag is invalidated"""
+        assert shared_flight("test", "key", lambda: 1, tags=["room:1"]) == 1
+        assert shared_flight("test", "key", lambda: 2, tags=["room:1"]) == 1
+
+        invalidate_flights("room:1")
+        assert shared_flight("test", "key", lambda: 3, tags=["room:1"]) == 3
+
+        text = fresh_metrics.expose()
+        assert 'single_flight_calls_total{flight="test",result="leader"} 2' in text
+        assert 'single_flight_calls_total{flight="test",result="shared"} 1' in text
+
+    def test_follower_computes_when_leader_is_slow(self, settings, fresh_metrics):
+        """Test waiting on another worker is bounded by SINGLE_FLIGHT_WAIT"""
+        settings.SINGLE_FLIGHT_WAIT = 0.05
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "slow"
+
+        leader = threading.Thread(target=lambda: shared_flight("test", "key", slow))
+        leader.start()
+        started.wait(5)
+        try:
+            assert shared_flight("test", "key", lambda: "own") == "own"
+        finally:
+            release.set()
+            leader.join(5)
+        assert (
+            'single_flight_calls_total{flight="test",result="timeout"} 1'
+            in fresh_metrics.expose()
+        )
+
+    def test_availability_checks_are_coalesced(
+        self, client, admin_user, test_room, django_assert_num_queries
+    ):
+        """Test repeated checks reuse the result until a booking changes"""
+        url = reverse("rooms:check_availability", kwargs={"pk": test_room.pk})
+        dates = {
+            "check_in": date.today() + timedelta(days=3),
+            "check_out": date.today() + timedelta(days=5),
+        }
+        assert client.get(url, dates).json()["available"] is True
+        with django_assert_num_queries(0):
+            assert client.get(url, dates).json()["available"] is True
+
+        Booking.objects.create(
+            user=admin_user,
+            room=test_room,
+            adults=1,
+            status="confirmed",
+            total_price=Decimal("200.00"),
+            **dates,
+        )
+        assert client.get(url, dates).json()["available"] is False
+
+
+@pytest.mark.django_db
+class TestQueryInspection:
+    def per_row_view(self, request):
+        for room in Room.objects.all():
+            Room.objects.get(pk=room.pk)
+        return HttpResponse("ok")
+
+    @pytest.fixture
+    def rooms(self):
+        return [
+            Room.objects.create(
+                name=f"Room {i}",
+                room_number=str(300 + i),
+                floor=3,
+                room_type="double",
+                bed_type="queen",
+                price_per_night=Decimal("100.00"),
+                capacity_adults=2,
+                capacity_children=0,
+            )
+            for i in range(4)
+        ]
+
+    def test_fingerprint_collapses_literals_and_in_lists(self):
+        """Test per-row variants of a query share one fingerprint"""
+        assert fingerprint(
+            "SELECT * FROM t WHERE id IN (%s, %s, %s) LIMIT 21"
+        ) == fingerprint("SELECT * FROM t WHERE id IN (%s) LIMIT 1")
+        assert fingerprint("SELECT 'a'") == fingerprint("SELECT 'b''c'")
+
+    def test_middleware_logs_repeated_queries(self, settings, rooms, caplog):
+        """Test a sampled request emits a structured line flagging the N+1"""
+        settings.SQL_INSPECT_SAMPLE_RATE = 1.0
+        settings.SQL_INSPECT_N_PLUS_ONE_THRESHOLD = 3
+        middleware = QueryInspectMiddleware(self.per_row_view)
+
+        with caplog.at_level(logging.INFO, logger="core.sql"):
+            response = middleware(RequestFactory().get("/rooms/"))
+
+        assert response.status_code == 200
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["path"] == "/rooms/"
+        assert record["queries"] == 5
+        assert record["n_plus_one"] is True
+        assert record["repeated"][0]["count"] == 4
+        assert caplog.records[-1].levelno == logging.WARNING
+
+    def test_middleware_can_fail_tests(self, settings, rooms):
+        """Test SQL_INSPECT_RAISE turns a detected N+1 into an error"""
+        settings.SQL_INSPECT_SAMPLE_RATE = 1.0
+        settings.SQL_INSPECT_N_PLUS_ONE_THRESHOLD = 3
+        settings.SQL_INSPECT_RAISE = True
+
+        with pytest.raises(NPlusOneError):
+            QueryInspectMiddleware(self.per_row_view)(RequestFactory().get("/"))
+
+    def test_middleware_unused_when_sampling_off(self, settings):
+        """Test a zero sample rate drops the middleware from the chain"""
+        settings.SQL_INSPECT_SAMPLE_RATE = 0
+
+        with pytest.raises(MiddlewareNotUsed):
+            QueryInspectMiddleware(self.per_row_view)
+
+    def test_detect_n_plus_one_context_manager(self, rooms):
+        """Test the helper for asserting query shapes in tests"""
+        with detect_n_plus_one(threshold=5):
+            self.per_row_view(None)
+
+        with pytest.raises(NPlusOneError):
+            with detect_n_plus_one(threshold=4):
+                self.per_row_view(None)
+
+
+@pytest.mark.django_db
+class TestServerTiming:
+    def test_header_breaks_down_catalog_request(self, client, settings, test_room):
+        """Test the room list reports db, catalog, template and total timers"""
+        settings.SERVER_TIMING_ENABLED = True
+        response = client.get(reverse("rooms:room_list"))
+
+        metrics = {
+            entry.split(";")[0] for entry in response["Server-Timing"].split(", ")
+        }
+        assert {"db", "catalog", "template", "cache", "total"} <= metrics
+        assert re.search(r'db;dur=[\d.]+;desc="\d+ queries"', response["Server-Timing"])
+
+    def test_availability_timer(self, client, settings, test_room):
+        """Test availability endpoints report their overlap check"""
+        settings.SERVER_TIMING_ENABLED = True
+        tomorrow = timezone.now().date() + timedelta(days=1)
+        response = client.get(
+            reverse("bookings:check_availability", kwargs={"room_pk": test_room.pk}),
+            {"check_in": tomorrow, "check_out": tomorrow + timedelta(days=2)},
+        )
+
+        assert "availability;dur=" in response["Server-Timing"]
+
+    def test_disabled_by_default(self, client, test_room):
+        """Test no header is sent unless the setting is on"""
+        response = client.get(reverse("rooms:room_list"))
+
+        assert not response.has_header("Server-Timing")
+
+    def test_timer_is_noop_outside_requests(self):
+        """Test hot-path timers cost nothing when nothing collects them"""
+        with timer("catalog"):
+            pass
+
+        with collect_server_timing() as timing:
+            with timer("catalog", "rooms"):
+                pass
+            with timer("catalog"):
+                pass
+        assert list(timing.metrics) == ["catalog"]
+        assert timing.header().startswith("catalog;dur=")
+        assert timing.header().endswith(';desc="rooms"')
+
+
+@pytest.fixture
+def fresh_metrics():
+    REGISTRY.reset()
+    yield REGISTRY
+    REGISTRY.reset()
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    def test_latency_histogram_per_url_name(self, client, fresh_metrics, test_room):
+        """Test requests are recorded under their namespaced URL name"""
+        tomorrow = timezone.now().date() + timedelta(days=1)
+        url = reverse("rooms:check_availability", kwargs={"pk": test_room.pk})
+        for _ in range(3):
+            client.get(url, {"check_in": tomorrow, "check_out": tomorrow})
+
+        text = fresh_metrics.expose()
+        assert (
+            'http_requests_total{view="rooms:check_availability",method="GET",'
+            'status="200"} 3'
+        ) in text
+        assert (
+            'http_request_duration_seconds_bucket{view="rooms:check_availability",'
+            'le="+Inf"} 3'
+        ) in text
+        assert (
+            'http_request_duration_seconds_count{view="rooms:check_availability"} 3'
+            in text
+        )
+        assert "# TYPE db_queries_per_request histogram" in text
+
+    def test_query_counts_skip_fingerprinting(
+        self, client, monkeypatch, fresh_metrics, test_room
+    ):
+        """Test the always-on middleware counts queries without fingerprinting"""
+
+        def fail(sql):
+            raise AssertionError("fingerprint() ran")
+
+        monkeypatch.setattr("core.instrumentation.fingerprint", fail)
+        client.get(reverse("rooms:room_detail", kwargs={"pk": test_room.pk}))
+
+        text = fresh_metrics.expose()
+        assert 'db_queries_per_request_count{view="rooms:room_detail"} 1' in text
+        assert (
+            'db_queries_per_request_bucket{view="rooms:room_detail",le="1"} 0' in text
+        )
+
+    def test_business_counters(self, client, admin_user, test_booking, fresh_metrics):
+        """Test created bookings and rejected overlaps are counted"""
+        client.login(username="admin", password="admin123")
+        client.post(
+            reverse(
+                "bookings:booking_create", kwargs={"room_pk": test_booking.room.pk}
+            ),
+            {
+                "check_in": test_booking.check_in,
+                "check_out": test_booking.check_out,
+                "adults": 1,
+                "children": 0,
+            },
+        )
+        Booking.objects.create(
+            user=admin_user,
+            room=test_booking.room,
+            check_in=test_booking.check_out + timedelta(days=5),
+            check_out=test_booking.check_out + timedelta(days=6),
+            adults=1,
+            total_price=Decimal("100.00"),
+        )
+
+        text = fresh_metrics.expose()
+        assert "booking_conflicts_total 1" in text
+        assert "bookings_created_total 1" in text
+
+    def test_endpoint_requires_staff_or_token(self, client, settings, admin_user):
+        """Test the scrape URL is protected"""
+        settings.METRICS_TOKEN = "scrape-secret"
+        url = reverse("core:metrics")
+
+        assert client.get(url).status_code == 403
+        assert client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code == 403
+
+        response = client.get(url, HTTP_AUTHORIZATION="Bearer scrape-secret")
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+
+        client.login(username="admin", password="admin123")
+        assert client.get(url).status_code == 200
+
+    def test_workers_aggregate_through_snapshot_files(
+        self, settings, tmp_path, fresh_metrics
+    ):
+        """Test snapshots written by other workers are summed into the scrape"""
+        settings.METRICS_DIR = str(tmp_path)
+        BOOKINGS_CANCELLED.inc()
+        HTTP_REQUEST_DURATION.observe(0.02, view="core:home")
+        fresh_metrics.flush()
+
+        # PID 1 always runs, so its snapshot counts as a live worker's
+        fresh_metrics.snapshot_path().rename(fresh_metrics.snapshot_path(pid=1))
+
+        text = fresh_metrics.expose()
+        assert "bookings_cancelled_total 2" in text
+        assert 'http_request_duration_seconds_count{view="core:home"} 2' in text
+        assert (
+            'http_request_duration_seconds_bucket{view="core:home",le="0.01"} 0' in text
+        )
+        assert (
+            'http_request_duration_seconds_bucket{view="core:home",le="0.025"} 2'
+            in text
+        )
+
+    def test_exited_workers_snapshots_are_removed(
+        self, settings, tmp_path, fresh_metrics
+    ):
+        """Test a snapshot left by a worker that exited is deleted, not summed"""
+        settings.METRICS_DIR = str(tmp_path)
+        exited = subprocess.Popen([sys.executable, "-c", ""])
+        exited.wait()
+        BOOKINGS_CANCELLED.inc()
+        fresh_metrics.flush()
+        fresh_metrics.snapshot_path().rename(fresh_metrics.snapshot_path(exited.pid))
+
+        assert "bookings_cancelled_total 1" in fresh_metrics.expose()
+        assert not fresh_metrics.snapshot_path(exited.pid).exists()
+
+    def test_concurrent_flushes_never_raise(self, settings, tmp_path, fresh_metrics):
+        """Test threads flushing on every change neither fail nor leave temp files"""
+        settings.METRICS_DIR = str(tmp_path)
+        settings.METRICS_FLUSH_INTERVAL = 0
+        errors = []
+
+        def book():
+            try:
+                for _ in range(300):
+                    BOOKINGS_CREATED.inc()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=book) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        fresh_metrics.flush()
+
+        assert errors == []
+        assert [path.name for path in tmp_path.iterdir()] == [
+            fresh_metrics.snapshot_path().name
+        ]
+        snapshot = json.loads(fresh_metrics.snapshot_path().read_text())
+        assert snapshot["bookings_created_total"] == {"[]": 2400}
+
+    def test_failed_flush_is_logged(self, settings, tmp_path, fresh_metrics, caplog):
+        """Test an unwritable METRICS_DIR is logged instead of failing the caller"""
+        settings.METRICS_DIR = str(tmp_path / "taken")
+        settings.METRICS_FLUSH_INTERVAL = 0
+        (tmp_path / "taken").write_text("not a directory")
+
+        with caplog.at_level(logging.ERROR, logger="core.metrics"):
+            BOOKINGS_CREATED.inc()
+
+        assert "Could not write metrics snapshot" in caplog.text
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    settings.PROFILE_DIR = str(tmp_path / "profiles")
+    return tmp_path / "profiles"
+
+
+@pytest.mark.django_db
+class TestProfiling:
+    def test_manager_request_is_profiled(
+        self, client, profile_dir, manager_user, test_room
+    ):
+        """Test the header saves a .prof and SQL log for a Manager"""
+        client.login(username="manager", password="manager123")
+        response = client.get(reverse("rooms:room_list"), HTTP_X_PROFILE="1")
+
+        assert response.status_code == 200
+        name = response["X-Profile-Id"]
+        assert (profile_dir / f"{name}.prof").exists()
+
+        log = json.loads((profile_dir / f"{name}.json").read_text())
+        assert log["path"] == reverse("rooms:room_list")
+        assert log["user"] == "manager"
+        assert log["query_count"] == len(log["queries"]) > 0
+
+    def test_switch_ignored_for_other_users(self, client, profile_dir):
+        """Test guests and staff outside Managers cannot trigger a capture"""
+        response = client.get(reverse("rooms:room_list") + "?_profile=1")
+        assert "X-Profile-Id" not in response
+
+        User.objects.create_user(username="clerk", password="clerk123", is_staff=True)
+        client.login(username="clerk", password="clerk123")
+        response = client.get(reverse("rooms:room_list"), HTTP_X_PROFILE="1")
+        assert "X-Profile-Id" not in response
+        assert not profile_dir.exists()
+
+    def test_directory_rotates(self, client, settings, profile_dir, admin_user):
+        """Test only PROFILE_KEEP captures are kept"""
+        settings.PROFILE_KEEP = 2
+        profile_dir.mkdir()
+        for stale in ("20200101-000000-00000000", "20200101-000001-00000001"):
+            (profile_dir / f"{stale}.json").write_text("{}")
+            (profile_dir / f"{stale}.prof").write_bytes(b"")
+
+        client.login(username="admin", password="admin123")
+        name = client.get(reverse("core:home"), HTTP_X_PROFILE="1")["X-Profile-Id"]
+
+        assert sorted(path.stem for path in profile_dir.glob("*.json")) == [
+            "20200101-000001-00000001",
+            name,
+        ]
+        assert not (profile_dir / "20200101-000000-00000000.prof").exists()
+
+    def test_admin_summary_lists_top_functions(self, client, profile_dir, admin_user):
+        """Test the admin pages list captures and their cumulative hot spots"""
+        client.login(username="admin", password="admin123")
+        name = client.get(reverse("core:home"), HTTP_X_PROFILE="1")["X-Profile-Id"]
+
+        response = client.get(reverse("profile_list"))
+        assert response.status_code == 200
+        assert name in response.content.decode()
+
+        response = client.get(reverse("profile_detail", args=[name]))
+        assert response.status_code == 200
+        functions = response.context["stats"]["functions"]
+        assert functions
+        cumulative = [row["cumtime_ms"] for row in functions]
+        assert cumulative == sorted(cumulative, reverse=True)
+
+        assert (
+            client.get(reverse("profile_detail", args=["missing"])).status_code == 404
+        )
+
+    def test_missing_or_partial_prof_is_not_found(
+        self, client, profile_dir, admin_user
+    ):
+        """Test a capture whose .prof is gone or truncated returns 404"""
+        client.login(username="admin", password="admin123")
+        name = client.get(reverse("core:home"), HTTP_X_PROFILE="1")["X-Profile-Id"]
+        prof_path = profile_dir / f"{name}.prof"
+
+        prof_path.write_bytes(prof_path.read_bytes()[:10])
+        assert client.get(reverse("profile_detail", args=[name])).status_code == 404
+
+        prof_path.unlink()
+        assert client.get(reverse("profile_detail", args=[name])).status_code == 404
+
+    def test_admin_summary_requires_manager(self, client, profile_dir, test_room):
+        """Test anonymous and regular users are turned away"""
+        response = client.get(reverse("profile_list"))
+        assert response.status_code == 302
+        assert reverse("admin:login") in response.url
+
+        User.objects.create_user(username="guest", password="guest123")
+        client.login(username="guest", password="guest123")
+        assert client.get(reverse("profile_list")).status_code == 302
+
+
+@pytest.mark.django_db
+class TestBenchmarks:
+    def test_suite_records_time_queries_and_memory(self):
+        """Test every scenario runs and reports its measurements"""
+        seed_hotel(rooms=3, bookings=30, years=1)
+
+        results = run_benchmarks(iterations=2)
+
+        assert set(results["scenarios"]) == {
+            "room_list_dates",
+            "room_availability",
+            "booking_availability",
+            "booking_create",
+            "dashboard",
+            "analytics_changelist",
+            "year_data",
+        }
+        for result in results["scenarios"].values():
+            assert result["median_ms"] > 0
+            assert result["queries"] >= 1
+            assert result["peak_kb"] > 0
+
+    def test_compare_flags_regressions(self):
+        """Test extra queries and slowdowns beyond the tolerance are reported"""
+        baseline = {
+            "scenarios": {
+                "dashboard": {"queries": 10, "median_ms": 10.0, "peak_kb": 100.0}
+            }
+        }
+        results = {
+            "scenarios": {
+                "dashboard": {"queries": 11, "median_ms": 12.0, "peak_kb": 200.0},
+                "year_data": {"queries": 3, "median_ms": 1.0, "peak_kb": 10.0},
+            }
+        }
+
+        regressions = compare(results, baseline, time_tolerance=0.25)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("dashboard: 11 queries")
+        assert regressions[1].startswith("dashboard: peak")
+
+    def test_command_compares_against_baseline(self, tmp_path):
+        """Test the command writes results and fails on a stored regression"""
+        output = tmp_path / "latest.json"
+        baseline = tmp_path / "baseline.json"
+        options = {
+            "rooms": 2,
+            "bookings": 10,
+            "iterations": 1,
+            "scenario": ["year_data"],
+            "current_db": True,
+            "output": str(output),
+            "baseline": str(baseline),
+        }
+
+        call_command("benchmark", save_baseline=True, **options)
+        assert json.loads(output.read_text())["scenarios"]["year_data"]["queries"]
+
+        stored = json.loads(baseline.read_text())
+        stored["scenarios"]["year_data"]["queries"] = 0
+        baseline.write_text(json.dumps(stored))
+        with pytest.raises(CommandError, match="year_data"):
+            call_command("benchmark", **options)
+
+
+@pytest.mark.django_db
+class TestSeeding:
+    def test_seeded_bookings_never_overlap(self):
+        """Test the seeded schedule keeps each room's stays apart"""
+        counts = seed_hotel(rooms=5, bookings=200, years=1, seed=7)
+        assert counts["rooms"] == 5
+        assert Booking.objects.count() == counts["bookings"] > 100
+
+        for room in Room.objects.all():
+            stays = list(
+                room.booking_set.order_by("check_in").values_list(
+                    "check_in", "check_out"
+                )
+            )
+            for (_, previous_out), (next_in, _) in zip(stays, stays[1:]):
+                assert previous_out <= next_in
+
+    def test_schedule_is_deterministic(self):
+        """Test the same seed draws the same stays"""
+        first = build_schedules(np.random.default_rng(3), 4, 100, date(2024, 1, 1), 400)
+        second = build_schedules(
+            np.random.default_rng(3), 4, 100, date(2024, 1, 1), 400
+        )
+        for left, right in zip(first, second):
+            assert np.array_equal(left, right)
+
+    def test_command_creates_related_rows(self):
+        """Test seed_hotel writes users, rooms, bookings and notifications"""
+        out = StringIO()
+        call_command("seed_hotel", rooms=3, bookings=60, years=1, stdout=out)
+
+        bookings = Booking.objects.count()
+        assert "Created 12 users, 3 rooms" in out.getvalue()
+        assert Notification.objects.count() == bookings > 0
+        assert not Booking.objects.filter(check_out__lte=F("check_in")).exists()
+        assert set(Booking.objects.values_list("status", flat=True)) <= {
+            "pending",
+            "confirmed",
+            "cancelled",
+            "completed",
+        }
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLoadTest:
+    def test_drives_both_endpoints_against_live_server(self, live_server):
+        """Test simulated guests book through HTTP and every outcome is counted"""
+        seed_hotel(rooms=2, bookings=10, years=1, notifications=False)
+        room_ids = list(Room.objects.values_list("pk", flat=True))
+
+        report = run_load_test(
+            live_server.url,
+            room_ids,
+            users=3,
+            requests_per_user=4,
+            concurrency=1,
+            window=5,
+            seed=1,
+        )
+
+        assert report["requests"] == 12
+        assert report["errors"] == 0
+        assert report["created"] + report["conflicts"] == 12
+        assert report["created"] >= 1
+        assert set(report["endpoints"]) == {"book_room", "booking_create"}
+        assert report["latency_ms"]["p50"] <= report["latency_ms"]["max"]
+        assert find_overlaps(room_ids) == []
+
+    def test_availability_benchmark_compares_connection_profiles(
+        self, settings, test_room
+    ):
+        """Test the availability benchmark runs each profile and restores settings"""
+        settings.ALLOWED_HOSTS = ["localhost"]
+        conn_max_age = connection.settings_dict["CONN_MAX_AGE"]
+
+        report = run_availability_benchmark(
+            [test_room.pk], requests=24, concurrency=4, window=5, seed=1
+        )
+
+        assert set(report) == {"per-request", "persistent"}
+        for stats in report.values():
+            assert stats["requests"] == 24
+            assert stats["errors"] == 0
+            assert stats["latency_ms"]["p50"] <= stats["latency_ms"]["max"]
+        assert connection.settings_dict["CONN_MAX_AGE"] == conn_max_age
+
+    def test_connections_command_does_not_coalesce(self, test_room, fresh_metrics):
+        """Test every benchmarked availability check reaches the database"""
+        out = StringIO()
+        call_command(
+            "benchmark_connections",
+            "--current-db",
+            "--requests=40",
+            "--concurrency=4",
+            "--profile=per-request",
+            stdout=out,
+        )
+
+        assert out.getvalue().startswith("per-request")
+        assert SINGLE_FLIGHT_CALLS.snapshot() == {}
+
+    def test_pool_profile_requires_postgres(self):
+        """Test asking for a connection pool on other databases fails early"""
+        if connection.vendor == "postgresql":
+            pytest.skip("PostgreSQL supports pooling")
+        with pytest.raises(ValueError):
+            with connection_profile("pool", pool_size=2):
+                pass
+
+    def test_find_overlaps_reports_intersecting_stays(self, test_booking):
+        """Test overlapping active bookings are detected and cancelled ones ignored"""
+        clash = Booking.objects.create(
+            user=test_booking.user,
+            room=test_booking.room,
+            check_in=test_booking.check_in + timedelta(days=1),
+            check_out=test_booking.check_out + timedelta(days=1),
+            adults=1,
+            status="pending",
+        )
+        assert find_overlaps() == [(test_booking.pk, clash.pk)]
+
+        clash.status = "cancelled"
+        clash.save()
+        assert find_overlaps() == []
+
+
+@pytest.mark.django_db
+class TestEstimatedCountPaginator:
+    @pytest.fixture
+    def notifications(self, admin_user):
+        Notification.objects.bulk_create(
+            Notification(
+                user=admin_user,
+                type="info" if n % 2 else "warning",
+                title=f"N{n}",
+                message="",
+            )
+            for n in range(30)
+        )
+        return Notification.objects.order_by("pk")
+
+    def test_exact_count_without_statistics(self, notifications):
+        """Test databases without planner statistics count exactly"""
+        assert planner_estimate(notifications) is None
+        assert EstimatedCountPaginator(notifications, 10).count == 30
+
+    def test_unfiltered_count_uses_estimate(self, monkeypatch, settings, notifications):
+        """Test large unfiltered lists use the estimate without a COUNT query"""
+        monkeypatch.setattr("core.paginator.planner_estimate", lambda qs: 20_000_000)
+        settings.ADMIN_ESTIMATED_COUNT_THRESHOLD = 1000
+
+        with CaptureQueriesContext(connection) as queries:
+            paginator = EstimatedCountPaginator(notifications, 100)
+            assert paginator.count == 20_000_000
+            assert paginator.num_pages == 200_000
+
+        assert len(queries) == 0
+
+    def test_filtered_and_small_lists_count_exactly(
+        self, monkeypatch, settings, notifications
+    ):
+        """Test filtered lists and estimates under the threshold count exactly"""
+        monkeypatch.setattr("core.paginator.planner_estimate", lambda qs: 500)
+        settings.ADMIN_ESTIMATED_COUNT_THRESHOLD = 1000
+        assert EstimatedCountPaginator(notifications, 10).count == 30
+
+        settings.ADMIN_ESTIMATED_COUNT_THRESHOLD = 100
+        filtered = notifications.filter(type="info")
+        assert EstimatedCountPaginator(filtered, 10).count == 15
+
+    def test_changelist_skips_full_count(self, client, admin_user, notifications):
+        """Test filtered changelists run a single count query"""
+        client.force_login(admin_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                reverse("admin:core_notification_changelist"), {"type__exact": "info"}
+            )
+
+        assert response.status_code == 200
+        assert response.context["cl"].result_count == 15
+        counts = [query["sql"] for query in queries if "COUNT(" in query["sql"]]
+        assert sum('"core_notification"."type"' in sql for sql in counts) == 1
+        assert not any(sql.endswith('FROM "core_notification"') for sql in counts)
+
+
+@pytest.mark.django_db
+class TestAdminAutocomplete:
+    def autocomplete(self, client, field_name, term, page=1):
+        return client.get(
+            reverse("admin:autocomplete"),
+            {
+                "term": term,
+                "app_label": "bookings",
+                "model_name": "booking",
+                "field_name": field_name,
+                "page": page,
+            },
+        )
+
+    def test_booking_form_does_not_list_every_user(
+        self, client, admin_user, test_booking
+    ):
+        """Test the booking change form renders user/room as autocomplete widgets"""
+        User.objects.bulk_create(User(username=f"guest-{n:03d}") for n in range(50))
+        client.force_login(admin_user)
+
+        response = client.get(
+            reverse("admin:bookings_booking_change", args=[test_booking.pk])
+        )
+
+        assert response.status_code == 200
+        assert b"admin-autocomplete" in response.content
+        assert b"guest-049" not in response.content
+
+    def test_prefix_search(self, client, admin_user, test_room):
+        """Test lookups match the start of the indexed column only"""
+        User.objects.create_user(username="anna", email="anna@example.com")
+        User.objects.create_user(username="joanna", email="jo@example.com")
+        client.force_login(admin_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.autocomplete(client, "user", "ann")
+
+        assert [result["text"] for result in response.json()["results"]] == ["anna"]
+        assert not any("%ann%" in query["sql"] for query in queries)
+        rooms = self.autocomplete(client, "room", "10").json()["results"]
+        assert [result["id"] for result in rooms] == [str(test_room.pk)]
+
+    def test_prefix_search_ignores_case(self, client, admin_user, test_room):
+        """Test lowercase terms find mixed-case values through lower()"""
+        User.objects.create_user(username="Guest00001", email="guest@example.com")
+        test_room.room_number = "A101"
+        test_room.save()
+        client.force_login(admin_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            users = self.autocomplete(client, "user", "GUEST").json()["results"]
+
+        assert [result["text"] for result in users] == ["Guest00001"]
+        assert any("LOWER(" in query["sql"] for query in queries)
+        rooms = self.autocomplete(client, "room", "a1").json()["results"]
+        assert [result["id"] for result in rooms] == [str(test_room.pk)]
+
+    def test_results_are_capped(self, client, admin_user):
+        """Test at most AUTOCOMPLETE_MAX_RESULTS matches are counted and paged"""
+        User.objects.bulk_create(
+            User(username=f"guest-{n:03d}")
+            for n in range(AUTOCOMPLETE_MAX_RESULTS + 50)
+        )
+        client.force_login(admin_user)
+        last_page = AUTOCOMPLETE_MAX_RESULTS // 20
+
+        assert self.autocomplete(client, "user", "guest-").json()["pagination"]["more"]
+        response = self.autocomplete(client, "user", "guest-", page=last_page)
+        assert response.json()["pagination"]["more"] is False
+        response = self.autocomplete(client, "user", "guest-", page=last_page + 1)
+        assert response.status_code == 404
+
+
+def populate(kind, count, user):
+    """Top up the rows a budgeted page lists to ``count``"""
+    if kind == "rooms":
+        for n in range(Room.objects.count(), count):
+            room = Room.objects.create(
+                name=f"Budget Room {n}",
+                room_number=f"B{n:03d}",
+                floor=1,
+                room_type="double",
+                bed_type="queen",
+                price_per_night=Decimal("100.00"),
+                capacity_adults=2,
+                capacity_children=1,
+            )
+            for order in range(2):
+                RoomImage.objects.create(
+                    room=room,
+                    image="room_images/photo.jpg",
+                    is_primary=order == 0,
+                    order=order,
+                )
+    elif kind == "bookings":
+        today = timezone.now().date()
+        for n in range(Booking.objects.count(), count):
+            room = Room.objects.create(
+                name=f"Booked Room {n}",
+                room_number=f"K{n:03d}",
+                floor=1,
+                room_type="single",
+                bed_type="single",
+                price_per_night=Decimal("80.00"),
+                capacity_adults=1,
+                capacity_children=0,
+            )
+            Booking.objects.create(
+                user=user,
+                room=room,
+                check_in=today + timedelta(days=n),
+                check_out=today + timedelta(days=n + 2),
+                adults=1,
+                status="confirmed",
+            )
+    elif kind == "users":
+        team, _ = Group.objects.get_or_create(name="Team")
+        for n in range(User.objects.count(), count):
+            User.objects.create_user(username=f"budget-{n}").groups.add(team)
+    elif kind == "notifications":
+        for n in range(Notification.objects.count(), count):
+            Notification.objects.create(
+                user=user, type="info", title=f"Notice {n}", message="Hello"
+            )
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    @pytest.mark.parametrize("budget", QUERY_BUDGETS, ids=str)
+    def test_query_count_is_flat_and_within_budget(
+        self, budget, client, settings, admin_user, manager_user
+    ):
+        """Test each registered page stays within budget as its rows grow"""
+        settings.PAGE_CACHE_ENABLED = False
+        guest = User.objects.create_user(username="guest", password="guest123")
+        user = {"guest": guest, "manager": manager_user, "admin": admin_user}.get(
+            budget.role
+        )
+        if user is not None:
+            client.force_login(user)
+
+        counts = []
+        for size in budget.sizes:
+            populate(budget.data, size, user or guest)
+            # A first request absorbs one-off writes such as profile creation
+            client.get(budget.url, budget.params, headers=budget.headers)
+            for cache in caches.all():
+                cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(budget.url, budget.params, headers=budget.headers)
+            assert response.status_code == 200
+            counts.append(len(queries))
+
+        assert counts[0] == counts[-1], f"{budget} grows with rows: {counts}"
+        assert counts[-1] <= budget.max_queries, f"{budget} over budget: {counts}"
@@ -8,6 +8,10 @@ app_name = "core"
 urlpatterns = [
     path("", views.HomeView.as_view(), name="home"),
     path("dashboard/", views.DashboardView.as_view(), name="dashboard"),
+    path(
+        "dashboard/tiles/", views.DashboardTilesView.as_view(), name="dashboard_tiles"
+    ),
     path("contact/", views.ContactView.as_view(), name="contact"),
     path("notifications/", views.NotificationListView.as_view(), name="notifications"),
+    path("metrics/", views.metrics_view, name="metrics"),
 ]
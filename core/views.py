@@ -1,22 +1,28 @@
-from datetime import timedelta
-
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth.decorators import user_passes_test
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Avg, Count, Sum
-from django.utils import timezone
+from django.core.exceptions import PermissionDenied
+from django.db.models import Avg, Count
+from django.http import Http404, HttpResponse
+from django.shortcuts import render
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, ListView, TemplateView
 
-from bookings.models import Booking
 from rooms.models import Room
 
+from .cache import cache_anonymous_page
+from .dashboard import get_snapshot, recent_bookings
+from .db_router import read_from_replica
 from .forms import ContactForm
+from .metrics import REGISTRY
 from .models import Contact, Notification
+from .profiling import can_profile, list_profiles, load_profile, top_functions
 
 
-class DashboardView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
-    template_name = "core/dashboard.html"
-
+class ManagerRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     def test_func(self):
         if self.request.user.is_superuser:
             return True
@@ -25,47 +31,25 @@ class DashboardView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
             and self.request.user.groups.filter(name="Managers").exists()
         )
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        today = timezone.now().date()
-        thirty_days_ago = today - timedelta(days=30)
-
-        # Room statistics
-        context["total_rooms"] = Room.objects.count()
-        context["available_rooms"] = Room.objects.filter(is_active=True).count()
-
-        # Booking statistics
-        context["bookings_today"] = Booking.objects.filter(check_in=today).count()
-
-        context["bookings_month"] = Booking.objects.filter(
-            created_at__date__gte=thirty_days_ago
-        ).count()
-
-        # Revenue statistics
-        month_revenue = (
-            Booking.objects.filter(
-                created_at__date__gte=thirty_days_ago, status="confirmed"
-            ).aggregate(total=Sum("total_price"))["total"]
-            or 0
-        )
 
-        context["month_revenue"] = month_revenue
+class DashboardTilesView(ManagerRequiredMixin, TemplateView):
+    """The stat tiles alone, polled by the dashboard over HTMX"""
 
-        # Occupancy rate
-        total_room_days = context["total_rooms"] * 30
-        booked_room_days = Booking.objects.filter(
-            check_in__gte=thirty_days_ago, status="confirmed"
-        ).count()
+    template_name = "core/partials/dashboard_tiles.html"
 
-        context["occupancy_rate"] = (
-            (booked_room_days / total_room_days * 100) if total_room_days > 0 else 0
-        )
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(get_snapshot())
+        context["refresh_seconds"] = settings.DASHBOARD_SNAPSHOT_TTL
+        return context
 
-        # Recent bookings
-        context["recent_bookings"] = Booking.objects.select_related(
-            "user", "room"
-        ).order_by("-created_at")[:5]
 
+class DashboardView(DashboardTilesView):
+    template_name = "core/dashboard.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["recent_bookings"] = recent_bookings()
         return context
 
 
@@ -98,6 +82,8 @@ class NotificationListView(LoginRequiredMixin, ListView):
         return super().get(request, *args, **kwargs)
 
 
+@method_decorator(cache_anonymous_page(["home"]), name="dispatch")
+@method_decorator(read_from_replica(anonymous_only=True), name="dispatch")
 class HomeView(TemplateView):
     template_name = "core/home.html"
 
@@ -109,3 +95,42 @@ class HomeView(TemplateView):
             .prefetch_related("images")[:4]
         )
         return context
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint for staff sessions or the METRICS_TOKEN bearer"""
+    token = settings.METRICS_TOKEN
+    has_token = bool(token) and constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    )
+    if not (has_token or request.user.is_staff):
+        raise PermissionDenied
+    return HttpResponse(
+        REGISTRY.expose(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@user_passes_test(can_profile, login_url="admin:login")
+def profile_list_view(request):
+    return render(
+        request,
+        "admin/core/profile_list.html",
+        {"title": "Request profiles", "profiles": list_profiles()},
+    )
+
+
+@user_passes_test(can_profile, login_url="admin:login")
+def profile_detail_view(request, name):
+    profile = load_profile(name)
+    stats = top_functions(name) if profile is not None else None
+    if stats is None:
+        raise Http404("Profile not found")
+    return render(
+        request,
+        "admin/core/profile_detail.html",
+        {
+            "title": f"Profile {name}",
+            "profile": profile,
+            "stats": stats,
+        },
+    )
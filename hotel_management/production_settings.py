@@ -0,0 +1,24 @@
+from .settings import *
+
+DEBUG = False
+
+# Reuse database connections across requests instead of opening one per
+# request. DB_POOL=True (default) uses Django's psycopg 3 connection pool,
+# shared by all threads of a worker process; DB_POOL=False falls back to
+# persistent per-thread connections kept for DB_CONN_MAX_AGE seconds and
+# health-checked before reuse. The two are mutually exclusive in Django.
+# Replicas get the same treatment as the primary.
+DATABASES = {alias: {**database} for alias, database in DATABASES.items()}
+for database in DATABASES.values():
+    if os.getenv("DB_POOL", "True") == "True":
+        database["OPTIONS"] = {
+            **database.get("OPTIONS", {}),
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            },
+        }
+    else:
+        database["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+        database["CONN_HEALTH_CHECKS"] = True
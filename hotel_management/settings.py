@@ -51,10 +51,16 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.PrecompressedStaticMiddleware",
+    "core.middleware.ServerTimingMiddleware",
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.QueryInspectMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ProfilerMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
@@ -99,8 +105,8 @@ DATABASES = {
         "NAME": os.getenv("DB_NAME"),
         "USER": os.getenv("DB_USER"),
         "PASSWORD": os.getenv("DB_PASSWORD"),
-        "HOST": "localhost",
-        "PORT": "5432",
+        "HOST": os.getenv("DB_HOST", "localhost"),
+        "PORT": os.getenv("DB_PORT", "5432"),
     }
     # "default": {
     #     "ENGINE": "django.db.backends.sqlite3",
@@ -108,6 +114,22 @@ DATABASES = {
     # }
 }
 
+# Read replicas (core.db_router): comma-separated hosts sharing the primary's
+# name and credentials. Analytics, admin reporting and anonymous catalog pages
+# read from them; the write path and reads after a write use the primary, and
+# a cookie keeps the visitor on the primary for REPLICA_PIN_SECONDS afterwards.
+DATABASE_REPLICAS = []
+for host in filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")):
+    alias = f"replica_{len(DATABASE_REPLICAS)}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["core.db_router.PrimaryReplicaRouter"]
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -157,6 +179,106 @@ MEDIA_ROOT = BASE_DIR / "media"
 STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 STATIC_ROOT = BASE_DIR / "staticfiles"
+STATIC_CACHE_MAX_AGE = 60 * 5
+
+# collectstatic writes content-hashed names plus precompressed .gz variants
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.storage.CompressedManifestStaticFilesStorage"},
+}
+
+# Media serving: "django" streams files with FileResponse, "x-accel" (nginx) and
+# "x-sendfile" (Apache/lighttpd) let the front server send the bytes.
+MEDIA_SERVE_MODE = os.getenv("MEDIA_SERVE_MODE", "django")
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv(
+    "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/"
+)
+MEDIA_PUBLIC_DIRECTORIES = ["room_images"]
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24
+
+# Caches. "default" is the shared backend (point CACHE_BACKEND/CACHE_LOCATION at
+# Redis or Memcached when running several workers); every subsystem namespace
+# puts a per-process LRU (core.cache_backends.TwoTierCache) in front of it and
+# trusts its local copy for CACHE_LOCAL_TIMEOUT seconds.
+CACHE_NAMESPACES = ("catalog", "analytics")
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    },
+    **{
+        namespace: {
+            "BACKEND": "core.cache_backends.TwoTierCache",
+            "LOCATION": namespace,
+            "KEY_PREFIX": namespace,
+            "TIMEOUT": 60 * 10,
+            "OPTIONS": {
+                "SHARED_ALIAS": "default",
+                "MAX_ENTRIES": int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "1000")),
+                "LOCAL_TIMEOUT": int(os.getenv("CACHE_LOCAL_TIMEOUT", "5")),
+            },
+        }
+        for namespace in CACHE_NAMESPACES
+    },
+}
+MEMOIZE_ENABLED = os.getenv("MEMOIZE_ENABLED", "True") == "True"
+
+# Full-page cache for anonymous catalog pages (core.cache.cache_anonymous_page)
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "True") == "True"
+PAGE_CACHE_ALIAS = "default"
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Manager dashboard tiles (core.dashboard); served stale and refreshed after this
+DASHBOARD_SNAPSHOT_TTL = int(os.getenv("DASHBOARD_SNAPSHOT_TTL", "30"))
+
+# Identical concurrent availability checks share one query (core.singleflight);
+# across workers a result is reused for this long, and followers wait at most
+# SINGLE_FLIGHT_WAIT seconds for the worker computing it
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "True") == "True"
+SINGLE_FLIGHT_RESULT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_RESULT_TIMEOUT", "2"))
+SINGLE_FLIGHT_WAIT = float(os.getenv("SINGLE_FLIGHT_WAIT", "0.5"))
+
+# Analytics charts (analytics.series.current_series); served stale and
+# refreshed by one worker after this many seconds
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", "60"))
+
+# Admin changelists on core.paginator.EstimatedCountPaginator switch from
+# COUNT(*) to planner statistics (PostgreSQL) above this many rows
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(
+    os.getenv("ADMIN_ESTIMATED_COUNT_THRESHOLD", "100000")
+)
+
+# Per-request SQL instrumentation (core.middleware.QueryInspectMiddleware)
+SQL_INSPECT_SAMPLE_RATE = float(os.getenv("SQL_INSPECT_SAMPLE_RATE", "0"))
+SQL_INSPECT_N_PLUS_ONE_THRESHOLD = int(
+    os.getenv("SQL_INSPECT_N_PLUS_ONE_THRESHOLD", "5")
+)
+SQL_INSPECT_RAISE = os.getenv("SQL_INSPECT_RAISE", "False") == "True"
+
+# Server-Timing response header (core.middleware.ServerTimingMiddleware)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "False") == "True"
+
+# Prometheus metrics (core.metrics); METRICS_DIR shares values between workers
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# On-demand cProfile captures for Managers (X-Profile: 1 or ?_profile=1)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "True") == "True"
+PROFILE_DIR = os.getenv("PROFILE_DIR") or str(BASE_DIR / "profiles")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "core": {"handlers": ["console"], "level": os.getenv("CORE_LOG_LEVEL", "INFO")}
+    },
+}
 
 
 UNFOLD: dict[str, Optional[str | bool]] = {
@@ -1,13 +1,24 @@
+import re
+
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from core.files import serve_media
+from core.views import profile_detail_view, profile_list_view
 
 urlpatterns = [
+    path("admin/profiles/", profile_list_view, name="profile_list"),
+    path("admin/profiles/<str:name>/", profile_detail_view, name="profile_detail"),
     path("admin/", admin.site.urls),
     path("", include("core.urls")),
     path("rooms/", include("rooms.urls")),
     path("bookings/", include("bookings.urls")),
     path("accounts/", include("accounts.urls")),
     path("analytics/", include("analytics.urls")),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    re_path(
+        r"^%s(?P<path>.*)$" % re.escape(settings.MEDIA_URL.lstrip("/")),
+        serve_media,
+        name="media",
+    ),
+]
@@ -5,6 +5,8 @@ from django.contrib import admin
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin
 
+from core.autocomplete import PrefixAutocompleteMixin
+
 from .constants import AMENITY_FIELDS
 from .models import Room, RoomImage
 
@@ -16,7 +18,7 @@ class RoomImageInline(admin.TabularInline):
 
 
 @admin.register(Room)
-class RoomAdmin(ModelAdmin):
+class RoomAdmin(PrefixAutocompleteMixin, ModelAdmin):
     list_display = [
         "room_number",
         "name",
@@ -27,6 +29,7 @@ class RoomAdmin(ModelAdmin):
     ]
     list_filter = ["room_type", "is_active", "bed_type", "floor"]
     search_fields = ["name", "room_number", "description"]
+    autocomplete_search_fields = ["room_number"]
     inlines = [RoomImageInline]
 
     fieldsets = (
@@ -51,6 +54,10 @@ class RoomAdmin(ModelAdmin):
         ("Additional Info", {"fields": ("description", "is_active")}),
     )
 
+    def get_queryset(self, request):
+        # image_preview reads the prefetched images instead of querying per row
+        return super().get_queryset(request).prefetch_related("images")
+
     def image_preview(self, obj: Any) -> str:
         primary_image = obj.get_primary_image()
         if primary_image:
@@ -63,4 +70,4 @@ class RoomAdmin(ModelAdmin):
     image_preview.short_description = "Preview"  # type: ignore
 
     class Media:
-        css = {"all": ("admin/css/custom_admin.css",)}
+        css = {"all": ("css/admin-custom.css",)}
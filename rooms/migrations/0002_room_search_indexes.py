@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from core.indexes import CreateRawIndexes, trigram_index
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0001_initial"),
+    ]
+
+    operations = [
+        CreateRawIndexes(
+            [
+                trigram_index("rooms_room_name_trgm_idx", "rooms_room", "name"),
+                trigram_index(
+                    "rooms_room_number_trgm_idx", "rooms_room", "room_number"
+                ),
+            ]
+        ),
+    ]
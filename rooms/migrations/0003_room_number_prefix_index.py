@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from core.indexes import CreateRawIndexes, lower_prefix_index
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0002_room_search_indexes"),
+    ]
+
+    operations = [
+        CreateRawIndexes(
+            [
+                # Admin autocomplete matches lower(room_number) by prefix
+                lower_prefix_index(
+                    "rooms_room_number_lower_prefix_idx", "rooms_room", "room_number"
+                ),
+            ]
+        ),
+    ]
@@ -7,6 +7,15 @@ from django.utils import timezone
 from imagekit.models import ProcessedImageField
 from imagekit.processors import ResizeToFit
 
+from core.cache import memoize, tag_versions
+
+
+def split_images(images):
+    """The primary (or first) image and the rest, keeping their order"""
+    primary = next((image for image in images if image.is_primary), None)
+    primary = primary or (images[0] if images else None)
+    return primary, [image for image in images if image is not primary]
+
 
 class Room(models.Model):
     ROOM_TYPES = (
@@ -81,17 +90,35 @@ class Room(models.Model):
         except ValueError as e:
             raise ValueError(str(e))
 
+    @property
+    def image_version(self):
+        """Version token bumped whenever one of the room's images changes"""
+        return tag_versions([f"room-images:{self.pk}"])[0]
+
+    def _images(self):
+        images = getattr(self, "_prefetched_objects_cache", {}).get("images")
+        if images is not None:
+            # Reuse prefetch_related("images") instead of querying per room
+            return split_images(list(images))
+        return self._stored_images()
+
+    @memoize(
+        "catalog",
+        key=lambda room: room.pk,
+        tags=lambda room: [f"room-images:{room.pk}"],
+    )
+    def _stored_images(self):
+        return split_images(list(self.images.all()))
+
     def get_primary_image(self):
         """Get the primary image or first image or None"""
-        return self.images.filter(is_primary=True).first() or self.images.first()
+        return self._images()[0]
 
     def get_gallery_images(self):
         """Get all images except primary for gallery"""
-        primary_image = self.get_primary_image()
-        if primary_image:
-            return self.images.exclude(id=primary_image.id)
-        return self.images.all()
+        return self._images()[1]
 
+    @memoize("catalog", key=lambda room: room.pk, tags=lambda room: [f"room:{room.pk}"])
     def get_amenities_list(self):
         """Get list of available amenities"""
         amenities = []
@@ -5,11 +5,15 @@ import pytest
 from django.contrib.auth.models import Group, Permission, User
 from django.contrib.contenttypes.models import ContentType
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
 from .models import Room, RoomImage
 
+TEST_GIF = b"GIF89a\x01\x00\x01\x00\x80\x01\x00\x00\x00\x00ccc,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;"
+
 
 @pytest.fixture
 def managers_group():
@@ -328,3 +332,186 @@ class TestRoomAvailability:
         data = response.json()
         assert data["available"] is False
         assert "Invalid date format" in data["message"]
+
+
+@pytest.mark.django_db
+class TestRoomPageCache:
+    def test_query_string_is_normalized(self, client, test_room):
+        """Test parameter order and empty values do not split the cache"""
+        url = reverse("rooms:room_list")
+        client.get(f"{url}?adults=2&room_type=double&children=")
+        response = client.get(f"{url}?room_type=double&adults=2")
+
+        assert response["X-Page-Cache"] == "HIT"
+        assert client.get(f"{url}?adults=1")["X-Page-Cache"] == "MISS"
+
+    def test_booking_invalidates_room_pages(self, client, test_room):
+        """Test a new booking refreshes the listing and the booked dates"""
+        user = User.objects.create_user(username="guest", password="guest123")
+        check_in = timezone.now().date() + timedelta(days=3)
+        detail_url = reverse("rooms:room_detail", kwargs={"pk": test_room.pk})
+        list_url = (
+            f"{reverse('rooms:room_list')}?check_in={check_in}"
+            f"&check_out={check_in + timedelta(days=2)}"
+        )
+        client.get(detail_url)
+        assert test_room.name.encode() in client.get(list_url).content
+
+        test_room.booking_set.create(
+            user=user,
+            check_in=check_in,
+            check_out=check_in + timedelta(days=2),
+            adults=1,
+            status="pending",
+            total_price=Decimal("200.00"),
+        )
+
+        detail = client.get(detail_url)
+        assert detail["X-Page-Cache"] == "MISS"
+        assert str(check_in).encode() in detail.content
+        assert test_room.name.encode() not in client.get(list_url).content
+
+    def test_detail_page_without_csrf_is_cached(self, client, test_room):
+        """Test the anonymous booking form carries no per-visitor token"""
+        url = reverse("rooms:room_detail", kwargs={"pk": test_room.pk})
+        first = client.get(url)
+
+        assert b"csrfmiddlewaretoken" not in first.content
+        assert client.get(url)["X-Page-Cache"] == "HIT"
+
+    def test_image_upload_invalidates_detail(
+        self, client, test_room, settings, tmp_path
+    ):
+        """Test adding a room image refreshes the cached detail page"""
+        settings.MEDIA_ROOT = tmp_path
+        url = reverse("rooms:room_detail", kwargs={"pk": test_room.pk})
+        client.get(url)
+        RoomImage.objects.create(
+            room=test_room,
+            image=SimpleUploadedFile("photo.gif", TEST_GIF, content_type="image/gif"),
+        )
+
+        assert client.get(url)["X-Page-Cache"] == "MISS"
+
+
+@pytest.mark.django_db
+class TestRoomFragmentCache:
+    def test_detail_fragments_reused_for_logged_in_users(
+        self, client, test_room, manager_user
+    ):
+        """Test gallery and amenity blocks are rendered once across users"""
+        url = reverse("rooms:room_detail", kwargs={"pk": test_room.pk})
+        client.force_login(manager_user)
+        client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert b"WiFi" in response.content
+        assert not any("rooms_roomimage" in q["sql"] for q in queries)
+
+    def test_room_update_refreshes_amenities(self, client, test_room, manager_user):
+        """Test fragments are keyed on Room.updated_at"""
+        url = reverse("rooms:room_detail", kwargs={"pk": test_room.pk})
+        client.force_login(manager_user)
+        assert b"Minibar" not in client.get(url).content
+
+        test_room.has_minibar = True
+        test_room.save()
+
+        assert b"Minibar" in client.get(url).content
+
+    def test_new_image_refreshes_room_card(
+        self, client, test_room, manager_user, settings, tmp_path
+    ):
+        """Test the image version busts cached cards when a photo is added"""
+        settings.MEDIA_ROOT = tmp_path
+        client.force_login(manager_user)
+        assert b"room_images/" not in client.get(reverse("rooms:room_list")).content
+
+        RoomImage.objects.create(
+            room=test_room,
+            image=SimpleUploadedFile("photo.gif", TEST_GIF, content_type="image/gif"),
+        )
+
+        assert b"room_images/" in client.get(reverse("rooms:room_list")).content
+
+
+@pytest.mark.django_db
+class TestRoomListHtmx:
+    def test_full_page_without_htmx(self, client, test_room):
+        """Test a normal request renders the whole layout"""
+        response = client.get(reverse("rooms:room_list"))
+
+        assert b"<html" in response.content
+        assert b'id="room-results"' in response.content
+        assert b"hx-swap-oob" not in response.content
+
+    def test_htmx_request_returns_partial(self, client, test_room):
+        """Test filter changes only receive results plus out-of-band blocks"""
+        response = client.get(
+            f"{reverse('rooms:room_list')}?adults=2&page=1", HTTP_HX_REQUEST="true"
+        )
+
+        assert response.status_code == 200
+        assert b"<html" not in response.content
+        assert test_room.name.encode() in response.content
+        assert b'id="room-filters"' in response.content
+        assert b'id="room-pagination"' in response.content
+        assert response.content.count(b'hx-swap-oob="true"') == 2
+        assert "HX-Request" in response["Vary"]
+
+    def test_partial_and_page_cached_separately(self, client, test_room):
+        """Test the page cache never serves a partial to a full-page request"""
+        url = reverse("rooms:room_list")
+        client.get(url, HTTP_HX_REQUEST="true")
+
+        response = client.get(url)
+        assert response["X-Page-Cache"] == "MISS"
+        assert b"<html" in response.content
+
+    def test_cached_partial_not_served_to_full_page_htmx(self, client, test_room):
+        """Test boosted and history-restore requests never get a cached partial"""
+        url = reverse("rooms:room_list")
+        client.get(url, HTTP_HX_REQUEST="true")
+
+        boosted = client.get(url, HTTP_HX_REQUEST="true", HTTP_HX_BOOSTED="true")
+        assert boosted["X-Page-Cache"] == "MISS"
+        assert b"<html" in boosted.content
+
+        restored = client.get(
+            url, HTTP_HX_REQUEST="true", HTTP_HX_HISTORY_RESTORE_REQUEST="true"
+        )
+        assert restored["X-Page-Cache"] == "HIT"
+        assert b"<html" in restored.content
+
+    def test_pagination_keeps_filters(self, client):
+        """Test page links carry the active filters for shareable URLs"""
+        for number in range(12):
+            Room.objects.create(
+                name=f"Room {number}",
+                room_number=f"2{number:02d}",
+                floor=2,
+                room_type="single",
+                bed_type="single",
+                price_per_night=Decimal("80.00"),
+                capacity_adults=2,
+                capacity_children=0,
+            )
+        response = client.get(
+            f"{reverse('rooms:room_list')}?room_type=single&adults=1",
+            HTTP_HX_REQUEST="true",
+        )
+
+        assert b'hx-get="?page=2&amp;room_type=single&amp;adults=1"' in response.content
+
+    def test_history_restore_gets_full_page(self, client, test_room):
+        """Test htmx history restoration still receives the whole layout"""
+        response = client.get(
+            reverse("rooms:room_list"),
+            HTTP_HX_REQUEST="true",
+            HTTP_HX_HISTORY_RESTORE_REQUEST="true",
+        )
+
+        assert b"<html" in response.content
@@ -6,10 +6,12 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ValidationError
-from django.db.models import Q
-from django.http import JsonResponse
+from django.db.models import Count, Q
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
+from django.utils.cache import patch_vary_headers
 from django.utils.decorators import method_decorator
 from django.views.generic import (
     CreateView,
@@ -21,6 +23,11 @@ from django.views.generic import (
 
 from accounts.decorators import group_required  # Updated this line
 from bookings.models import Booking
+from core.cache import cache_anonymous_page
+from core.db_router import read_from_replica
+from core.htmx import is_htmx_partial
+from core.instrumentation import timer
+from core.singleflight import coalesce
 
 from .forms import RoomForm, RoomImageFormSet
 from .models import Room, RoomImage
@@ -84,12 +91,15 @@ class BookingCreateView(LoginRequiredMixin, CreateView):
         return reverse_lazy("bookings:booking_detail", kwargs={"pk": self.object.pk})
 
 
+@method_decorator(cache_anonymous_page(["room_list"]), name="dispatch")
+@method_decorator(read_from_replica(anonymous_only=True), name="dispatch")
 class RoomListView(ListView):
     model = Room
     template_name = "rooms/room_list.html"
     context_object_name = "rooms"
     paginate_by = 9
 
+    @timer("catalog")
     def get_queryset(self):
         queryset = Room.objects.filter(is_active=True)
 
@@ -137,6 +147,16 @@ class RoomListView(ListView):
 
         return queryset.prefetch_related("images").distinct()
 
+    @timer("catalog")
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = super().paginate_queryset(
+            queryset, page_size
+        )
+        # Evaluate the page here so the catalog timer covers the availability
+        # subquery instead of leaving it to template rendering
+        len(object_list)
+        return paginator, page, object_list, is_paginated
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Add search parameters to context
@@ -147,9 +167,30 @@ class RoomListView(ListView):
         context["adults"] = self.request.GET.get("adults", "")
         context["children"] = self.request.GET.get("children", "")
         context["today"] = datetime.now().date()
+        filter_query = self.request.GET.copy()
+        filter_query.pop("page", None)
+        context["filter_query"] = filter_query.urlencode()
         return context
 
+    def render_to_response(self, context, **response_kwargs):
+        if not is_htmx_partial(self.request):
+            response = super().render_to_response(context, **response_kwargs)
+        else:
+            # Only the results (plus out-of-band filters and pagination) are
+            # swapped in, so skip base.html and the context processors.
+            context["htmx_partial"] = True
+            with timer("template"):
+                response = HttpResponse(
+                    render_to_string("rooms/partials/room_list_partial.html", context)
+                )
+        patch_vary_headers(response, ["HX-Request"])
+        return response
+
 
+@method_decorator(
+    cache_anonymous_page(lambda request, pk: [f"room:{pk}"]), name="dispatch"
+)
+@method_decorator(read_from_replica(anonymous_only=True), name="dispatch")
 class RoomDetailView(DetailView):
     model = Room
     template_name = "rooms/room_detail.html"
@@ -256,8 +297,12 @@ class RoomManagementView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["active_rooms"] = Room.objects.filter(is_active=True).count()
-        context["inactive_rooms"] = Room.objects.filter(is_active=False).count()
+        context.update(
+            Room.objects.aggregate(
+                active_rooms=Count("pk", filter=Q(is_active=True)),
+                inactive_rooms=Count("pk", filter=Q(is_active=False)),
+            )
+        )
         return context
 
 
@@ -286,12 +331,18 @@ def check_room_availability(request, pk):
             )
 
         # Check for overlapping bookings
-        overlapping_bookings = Booking.objects.filter(
-            room_id=pk,
-            status__in=["confirmed", "pending"],
-            check_in__lte=check_out_date,
-            check_out__gte=check_in_date,
-        ).exists()
+        with timer("availability"):
+            overlapping_bookings = coalesce(
+                "room_availability",
+                f"{pk}:{check_in_date}:{check_out_date}",
+                lambda: Booking.objects.filter(
+                    room_id=pk,
+                    status__in=["confirmed", "pending"],
+                    check_in__lte=check_out_date,
+                    check_out__gte=check_in_date,
+                ).exists(),
+                tags=[f"availability:{pk}"],
+            )
 
         return JsonResponse(
             {
@@ -327,7 +378,8 @@ def book_room(request, pk):
             )
 
             # Clean and validate
-            booking.clean()
+            with timer("availability"):
+                booking.clean()
 
             if isinstance(booking.check_in, str):
                 booking.check_in = datetime.strptime(